@@ -1,10 +1,11 @@
 #!/usr/bin/python3
 
 if __name__ == "__main__":
-	from ptsc import ast, builtins, environment, evaluator, lexer, tsobject, parser, repl, tstoken
+	from ptsc import ast, builtins, compiler, environment, evaluator, lexer, tsobject, parser, repl, tstoken, vm
 	import doctest
 	doctest.testmod(ast)
 	doctest.testmod(builtins)
+	doctest.testmod(compiler)
 	doctest.testmod(environment)
 	doctest.testmod(evaluator)
 	doctest.testmod(lexer)
@@ -12,3 +13,4 @@ if __name__ == "__main__":
 	doctest.testmod(parser)
 	doctest.testmod(repl)
 	doctest.testmod(tstoken)
+	doctest.testmod(vm)
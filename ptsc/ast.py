@@ -2,6 +2,14 @@
 """
 This module contains the abstract syntax tree node definitions.
 
+The parser shares literal nodes: every boolean literal is one of two module-level nodes, and
+each Parser makes one node per distinct integer or string literal. A parsed program is
+therefore a DAG rather than a tree, so Boolean, IntegerLiteral and StringLiteral nodes must
+not be modified once parsed - anything written to one would show up at every occurrence of
+that literal. The only exception is a cache whose value follows from the literal alone, like
+IntegerLiteral.Object. Passes that rewrite a program replace literal nodes in their parents
+instead, as the evaluator's constant folding does.
+
 >>> name = Identifier(Value="myVar", Token=tstoken.Token(Type=tstoken.TokenType.IDENT, Literal="myVar"))
 >>> val = Identifier(Value="anotherVar", Token=tstoken.Token(Type=tstoken.TokenType.IDENT, Literal="anotherVar"))
 >>> tok = tstoken.Token(Type=tstoken.TokenType.LET, Literal="let")
@@ -11,14 +19,64 @@ This module contains the abstract syntax tree node definitions.
 'let myVar = anotherVar;'
 """
 
+import sys
 import typing
 
 from . import tstoken
 
+# Node kinds, used to index the render handler table.
+NODE = 0
+PROGRAM = 1
+LET = 2
+RETURN = 3
+EXPRESSION_STATEMENT = 4
+BLOCK = 5
+IDENTIFIER = 6
+BOOLEAN = 7
+INTEGER = 8
+PREFIX = 9
+INFIX = 10
+IF = 11
+FUNCTION = 12
+CALL = 13
+STRING = 14
+ARRAY = 15
+INDEX = 16
+HASH = 17
+
+# Infix operator codes, resolved once at parse time and stored on each
+# InfixExpression so the evaluator can switch on an int rather than a string.
+OP_UNKNOWN = -1
+OP_ADD = 0
+OP_SUB = 1
+OP_MUL = 2
+OP_DIV = 3
+OP_LT = 4
+OP_GT = 5
+OP_EQ = 6
+OP_NOT_EQ = 7
+
+OPCODES = {
+	"+": OP_ADD,
+	"-": OP_SUB,
+	"*": OP_MUL,
+	"/": OP_DIV,
+	"<": OP_LT,
+	">": OP_GT,
+	"==": OP_EQ,
+	"!=": OP_NOT_EQ,
+}
+
 class Node():
-	pass
+	Kind = NODE
+	__slots__ = ()
+
+	def __str__(self) -> str:
+		return render(self)
 
 class Expression(Node):
+	__slots__ = ("Token",)
+
 	def __init__(self, *args, Token: tstoken.Token = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Token = Token if Token else tstoken.Token()
@@ -38,14 +96,21 @@ class Expression(Node):
 		return self.Token.Literal
 
 class Identifier(Expression):
+	Kind = IDENTIFIER
+	__slots__ = ("Value", "Depth", "Slot")
+
 	def __init__(self, *args, Value: str = "", **kwargs):
 		super().__init__(*args, **kwargs)
-		self.Value = Value
-
-	def __str__(self) -> str:
-		return self.Value
+		self.Value = sys.intern(Value)
+		# The index of this name in the local slots of the function that binds it, and how many
+		# functions out from the one in which it appears that is. Slot is -1 if the name isn't
+		# bound by any enclosing function (or hasn't been resolved).
+		self.Depth = 0
+		self.Slot = -1
 
 class Statement(Node):
+	__slots__ = ("Token",)
+
 	def __init__(self, *args, Token: tstoken.Token = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Token = Token if Token else tstoken.Token()
@@ -57,6 +122,9 @@ class Statement(Node):
 		return self.Token.Literal
 
 class Program():
+	Kind = PROGRAM
+	__slots__ = ("Statements",)
+
 	def __init__(self, Statements: typing.List[Statement] = None):
 		if Statements is None:
 			self.Statements = []
@@ -70,142 +138,286 @@ class Program():
 		return ""
 
 	def __str__(self) -> str:
-		return "".join(str(s) for s in self.Statements)
+		return render(self)
 
 	def __repr__(self) -> str:
-		return "".join(str(s) for s in self.Statements)
+		return render(self)
 
 #### STATEMENTS ####
 class LetStatement(Statement):
+	Kind = LET
+	__slots__ = ("Name", "Value")
+
 	def __init__(self, *args, Name: Identifier = None, Value: Expression = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Name = Name if Name else Identifier()
 		self.Value = Value
 
-	def __str__(self):
-		return f"{self.TokenLiteral()} {str(self.Name)} = {str(self.Value) if self.Value else ''};"
-
 class ReturnStatement(Statement):
+	Kind = RETURN
+	__slots__ = ("ReturnValue", "Tail")
+
 	def __init__(self, *args, ReturnValue: Expression = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.ReturnValue = ReturnValue if ReturnValue else Expression()
-
-	def __str__(self) -> str:
-		return f"{self.TokenLiteral()} {str(self.ReturnValue)};"
+		# Whether this returns the result of a call from a position where that result is
+		# guaranteed to become the enclosing function's result; set by the resolver.
+		self.Tail = False
 
 class ExpressionStatement(Statement):
+	Kind = EXPRESSION_STATEMENT
+	__slots__ = ("Expression",)
+
 	def __init__(self, *args, expression: Expression = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Expression = expression if expression else Expression()
 
-	def __str__(self) -> str:
-		return str(self.Expression) if self.Expression else ""
-
 class BlockStatement(Statement):
+	Kind = BLOCK
+	__slots__ = ("Statements",)
+
 	def __init__(self, *args, Statements: typing.List[Statement] = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Statements = Statements if Statements else []
 
-	def __str__(self) -> str:
-		return "".join(str(s) for s in self.Statements)
-
 #### EXPRESSIONS ####
 class Boolean(Expression):
+	# Shared between every occurrence of the literal; see the module docstring.
+	Kind = BOOLEAN
+	__slots__ = ("Value",)
+
 	def __init__(self, *args, Value: str = "", **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Value = Value
 
-	def __str__(self) -> str:
-		return self.Token.Literal
-
 class IntegerLiteral(Expression):
+	# Shared between the occurrences of the same literal in a program; see the module docstring.
+	Kind = INTEGER
+	__slots__ = ("Value", "Object")
+
 	def __init__(self, *args, Value: int = 0, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Value = Value
-
-	def __str__(self) -> str:
-		return self.Token.Literal
+		# The evaluated object, cached by the evaluator the first time the literal is evaluated.
+		self.Object = None
 
 class PrefixExpression(Expression):
+	Kind = PREFIX
+	__slots__ = ("Operator", "Right")
+
 	def __init__(self, *args, Operator: str = "", Right: Expression = None, **kwargs):
 		super().__init__(*args, **kwargs)
-		self.Operator = Operator
+		self.Operator = sys.intern(Operator)
 		self.Right = Right if Right else Expression()
 
-	def __str__(self) -> str:
-		return f"({self.Operator}{str(self.Right)})"
-
 class InfixExpression(Expression):
+	Kind = INFIX
+	__slots__ = ("Left", "Operator", "OpCode", "Right")
+
 	def __init__(self, *args, Left: Expression = None, Operator: str = "", Right: Expression = None, **kwargs):
+		"""
+		>>> InfixExpression(Operator="*").OpCode == OP_MUL
+		True
+		>>> InfixExpression(Operator="%").OpCode
+		-1
+		"""
 		super().__init__(*args, **kwargs)
 		self.Left = Left if Left else Expression()
-		self.Operator = Operator
+		self.Operator = sys.intern(Operator)
+		self.OpCode = OPCODES.get(Operator, OP_UNKNOWN)
 		self.Right = Right if Right else Expression()
 
-	def __str__(self) -> str:
-		return f"({str(self.Left)} {self.Operator} {str(self.Right)})"
-
 class IfExpression(Expression):
+	Kind = IF
+	__slots__ = ("Condition", "Consequence", "Alternative")
+
 	def __init__(self, *args, Condition: Expression = None, Consequence: BlockStatement = None, Alternative: BlockStatement = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Condition = Condition if Condition else Expression()
 		self.Consequence = Consequence if Consequence else BlockStatement()
 		self.Alternative = Alternative
 
-	def __str__(self) -> str:
-		ret = f"if{str(self.Condition)} {str(self.Consequence)}"
-		if self.Alternative is not None:
-			ret += f"else {str(self.Alternative)}"
-		return ret
-
 class FunctionLiteral(Expression):
+	Kind = FUNCTION
+	__slots__ = ("Parameters", "Body", "Locals", "NumLocals", "Calls", "Kernel")
+
 	def __init__(self, *args, Parameters: typing.List[Identifier] = None, Body: BlockStatement = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Parameters = Parameters if Parameters else []
-		self.Body = Body if Body else BlockStatement
-
-	def __str__(self) -> str:
-		return f"{self.TokenLiteral()}({', '.join(str(p) for p in self.Parameters)}) {str(self.Body)}"
+		self.Body = Body if Body else BlockStatement()
+		# Set when the function is resolved: a mapping of the function's parameter and local
+		# variable names to their slots, and the total number of slots it needs.
+		self.Locals: typing.Optional[typing.Dict[str, int]] = None
+		self.NumLocals = 0
+		# How many times functions created from this literal have been called, and - once
+		# that's enough to be worth it - a compiled Python function implementing the body,
+		# or False if the body can't be compiled. See evaluator.compileKernel.
+		self.Calls = 0
+		self.Kernel: typing.Union[None, bool, typing.Callable[..., typing.Any]] = None
 
 class CallExpression(Expression):
+	Kind = CALL
+	__slots__ = ("Function", "Arguments")
+
 	def __init__(self, *args, Function: Expression = None, Arguments: typing.List[Expression] = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Function = Function if Function else Expression()
 		self.Arguments = Arguments if Arguments else []
 
-	def __str__(self) -> str:
-		return f"{str(self.Function)}({', '.join(str(a) for a in self.Arguments)})"
-
 class StringLiteral(Expression):
+	# Shared like IntegerLiteral.
+	Kind = STRING
+	__slots__ = ("Value", "Object")
+
 	def __init__(self, *args, Value: str = "", **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Value = Value
-
-	def __str__(self) -> str:
-		return self.Token.Literal
+		# The evaluated object, cached by the evaluator the first time the literal is evaluated.
+		self.Object = None
 
 class ArrayLiteral(Expression):
+	Kind = ARRAY
+	__slots__ = ("Elements",)
+
 	def __init__(self, *args, Elements: typing.List[Expression] = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Elements = Elements if Elements else []
 
-	def __str__(self) -> str:
-		return f"[{', '.join(str(e) for e in self.Elements)}]"
-
 class IndexExpression(Expression):
+	Kind = INDEX
+	__slots__ = ("Left", "Index")
+
 	def __init__(self, *args, Left: Expression = None, Index: Expression = None, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.Left = Left if Left else Expression()
 		self.Index = Index if Index else Expression()
 
-	def __str__(self) -> str:
-		return f"({str(self.Left)}[{str(self.Index)}])"
-
 class HashLiteral(Expression):
-	def __init__(self, *args, Pairs: typing.Dict[Expression, Expression] = None, **kwargs):
-		super().__init__(*args, **kwargs)
-		self.Pairs = Pairs if Pairs else {}
+	Kind = HASH
+	__slots__ = ("Keys", "Values", "Prepared")
 
-	def __str__(self) -> str:
-		pstr = ', '.join(':'.join((k, v) for k,v in self.Pairs))
-		return f"{{{pstr}}}"
+	def __init__(self, *args, Keys: typing.List[Expression] = None, Values: typing.List[Expression] = None, **kwargs):
+		super().__init__(*args, **kwargs)
+		# The literal's keys and values, in source order; Values[i] is the value of Keys[i].
+		self.Keys = Keys if Keys else []
+		self.Values = Values if Values else []
+		# Built by the evaluator the first time the literal is evaluated; see
+		# evaluator.evalHashLiteral.
+		self.Prepared: typing.Optional[typing.List[typing.Tuple[typing.Any, typing.Any, Expression]]] = None
+
+#### RENDERING ####
+def _joined(nodes: typing.List[Node], sep: str = ", ") -> typing.List[typing.Any]:
+	parts = []
+	for n in nodes:
+		parts.append(n)
+		parts.append(sep)
+	if parts:
+		parts.pop()
+	return parts
+
+def _renderNode(node: Node) -> typing.Sequence[typing.Any]:
+	return (object.__str__(node),)
+
+def _renderProgram(node: Program) -> typing.Sequence[typing.Any]:
+	return node.Statements
+
+def _renderLet(node: LetStatement) -> typing.Sequence[typing.Any]:
+	return (node.Token.Literal, " ", node.Name, " = ", node.Value if node.Value else "", ";")
+
+def _renderReturn(node: ReturnStatement) -> typing.Sequence[typing.Any]:
+	return (node.Token.Literal, " ", node.ReturnValue, ";")
+
+def _renderExpressionStatement(node: ExpressionStatement) -> typing.Sequence[typing.Any]:
+	return (node.Expression if node.Expression else "",)
+
+def _renderIdentifier(node: Identifier) -> typing.Sequence[typing.Any]:
+	return (node.Value,)
+
+def _renderLiteral(node: Expression) -> typing.Sequence[typing.Any]:
+	return (node.Token.Literal,)
+
+def _renderPrefix(node: PrefixExpression) -> typing.Sequence[typing.Any]:
+	return ("(", node.Operator, node.Right, ")")
+
+def _renderInfix(node: InfixExpression) -> typing.Sequence[typing.Any]:
+	return ("(", node.Left, " ", node.Operator, " ", node.Right, ")")
+
+def _renderIf(node: IfExpression) -> typing.Sequence[typing.Any]:
+	if node.Alternative is not None:
+		return ("if", node.Condition, " ", node.Consequence, "else ", node.Alternative)
+	return ("if", node.Condition, " ", node.Consequence)
+
+def _renderFunction(node: FunctionLiteral) -> typing.Sequence[typing.Any]:
+	return [node.Token.Literal, "("] + _joined(node.Parameters) + [") ", node.Body]
+
+def _renderCall(node: CallExpression) -> typing.Sequence[typing.Any]:
+	return [node.Function, "("] + _joined(node.Arguments) + [")"]
+
+def _renderArray(node: ArrayLiteral) -> typing.Sequence[typing.Any]:
+	return ["["] + _joined(node.Elements) + ["]"]
+
+def _renderIndex(node: IndexExpression) -> typing.Sequence[typing.Any]:
+	return ("(", node.Left, "[", node.Index, "])")
+
+def _renderHash(node: HashLiteral) -> typing.Sequence[typing.Any]:
+	parts = ["{"]
+	for k, v in zip(node.Keys, node.Values):
+		parts += (k, ":", v, ", ")
+	if len(parts) > 1:
+		parts.pop()
+	parts.append("}")
+	return parts
+
+# Indexed by Node.Kind
+HANDLERS = (
+	_renderNode,
+	_renderProgram,
+	_renderLet,
+	_renderReturn,
+	_renderExpressionStatement,
+	_renderProgram,
+	_renderIdentifier,
+	_renderLiteral,
+	_renderLiteral,
+	_renderPrefix,
+	_renderInfix,
+	_renderIf,
+	_renderFunction,
+	_renderCall,
+	_renderLiteral,
+	_renderArray,
+	_renderIndex,
+	_renderHash
+)
+
+def render(node: typing.Union[Node, Program]) -> str:
+	"""
+	Renders a node and all of its children into a single string. The tree is walked with an
+	explicit stack rather than by recursing through each node's __str__, so no intermediate
+	strings are built for subtrees.
+
+	>>> one = IntegerLiteral(Value=1, Token=tstoken.Token(Type=tstoken.TokenType.INT, Literal="1"))
+	>>> two = IntegerLiteral(Value=2, Token=tstoken.Token(Type=tstoken.TokenType.INT, Literal="2"))
+	>>> x = Identifier(Value="x", Token=tstoken.Token(Type=tstoken.TokenType.IDENT, Literal="x"))
+	>>> sum = InfixExpression(Left=one, Operator="+", Right=PrefixExpression(Operator="-", Right=x))
+	>>> render(Program(Statements=[ExpressionStatement(expression=sum), ExpressionStatement(expression=two)]))
+	'(1 + (-x))2'
+	>>> render(ArrayLiteral(Elements=[one, IndexExpression(Left=x, Index=two)]))
+	'[1, (x[2])]'
+	>>> render(HashLiteral(Keys=[x, two], Values=[one, x]))
+	'{x:1, 2:x}'
+	"""
+	out = []
+	stack = [node]
+	pop, push = stack.pop, stack.extend
+	while stack:
+		item = pop()
+		if item.__class__ is str:
+			out.append(item)
+			continue
+		kind = getattr(item, "Kind", None)
+		if kind is None:
+			out.append(str(item))
+			continue
+		push(reversed(HANDLERS[kind](item)))
+	return "".join(out)
@@ -1,16 +1,22 @@
 from . import tsobject
 from . import evaluator
 
+_ARRAY_OBJ = tsobject.ObjectType.ARRAY_OBJ
+
+_lengths = {
+	tsobject.ObjectType.ARRAY_OBJ: lambda arg: len(arg.Elements),
+	tsobject.ObjectType.STRING_OBJ: lambda arg: len(arg.Value)
+}
+
 def lenFunc(*args) -> tsobject.Object:
 	if len(args) != 1:
 		return evaluator.newError(f"wrong number of arguments. got={len(args)}, want=1")
 
 	arg = args[0]
-	if isinstance(arg, tsobject.Array):
-		return tsobject.Integer(Value=len(arg.Elements))
-	if isinstance(arg, tsobject.String):
-		return tsobject.Integer(Value=len(arg.Value))
-	return evaluator.newError(f"argument to `len` not supported, got {arg.Type}")
+	length = _lengths.get(arg.Type)
+	if length is None:
+		return evaluator.newError(f"argument to `len` not supported, got {arg.Type}")
+	return tsobject.newInteger(length(arg))
 
 def putsFunc(*args) -> tsobject.Object:
 	for arg in args:
@@ -22,7 +28,7 @@ def firstFunc(*args) -> tsobject.Object:
 		return evaluator.newError(f"wrong number of arguments. got={len(args)}, want=1")
 
 	arg = args[0]
-	if arg.Type != tsobject.ObjectType.ARRAY_OBJ:
+	if arg.Type is not _ARRAY_OBJ:
 		return evaluator.newError(f"argument to `first` must be ARRAY, got {arg.Type}")
 
 	if len(arg.Elements) > 0:
@@ -34,7 +40,7 @@ def lastFunc(*args) -> tsobject.Object:
 		return evaluator.newError(f"wrong number of arguments. got={len(args)}, want=1")
 
 	arg = args[0]
-	if arg.Type != tsobject.ObjectType.ARRAY_OBJ:
+	if arg.Type is not _ARRAY_OBJ:
 		return evaluator.newError(f"argument to `last` must be ARRAY, got {arg.Type}")
 
 	if len(arg.Elements) > 0:
@@ -45,7 +51,7 @@ def restFunc(*args) -> tsobject.Object:
 	if len(args) != 1:
 		return evaluator.newError(f"wrong number of arguments. got={len(args)}, want=1")
 	arg = args[0]
-	if arg.Type != tsobject.ObjectType.ARRAY_OBJ:
+	if arg.Type is not _ARRAY_OBJ:
 		return evaluator.newError(f"argument to `rest` must be ARRAY, got {arg.Type}")
 	if len(arg.Elements) > 1:
 		return tsobject.Array(Elements=arg.Elements[1:])
@@ -56,12 +62,13 @@ def pushFunc(*args) -> tsobject.Object:
 		return evaluator.newError(f"wrong number of arguments. got={len(args)}, want=2")
 
 	arr, item = args[0], args[1]
-	if arr.Type != tsobject.ObjectType.ARRAY_OBJ:
+	if arr.Type is not _ARRAY_OBJ:
 		return evaluator.newError(f"first argument to `push` must be ARRAY, got {arr.Type}")
 
-	arr = arr.Elements
-	arr.append(item)
-	return tsobject.Array(Elements=arr)
+	arr.Elements.append(item)
+	# Inspect's cached string is out of date now.
+	arr.Inspected = None
+	return tsobject.Array(Elements=arr.Elements)
 
 builtins = {
 	"len": tsobject.Builtin(Fn=lenFunc),
@@ -0,0 +1,272 @@
+"""
+This module compiles a parsed program into flat bytecode, which is executed by the vm module.
+
+Instructions are a flat list of ints, two per instruction: an opcode followed by its operand
+(which is 0 for opcodes that don't take one). The operands of OP_CONST, OP_GET, OP_SET and
+OP_CLOSURE are indices into the constant pool, while the operands of OP_JMP and OP_JMPF are
+absolute positions in the instruction list. Identifiers that the evaluator's resolver has
+bound to a slot of the innermost function are read and written with OP_GETL and OP_SETL,
+whose operands are slot indices.
+
+>>> b = Compile(parser.Parser(lexer.Lexer("1 + 2;")).ParseProgram())
+>>> b.Instructions
+[0, 0, 0, 1, 2, 0, 17, 0]
+>>> b.Constants
+[1, 2]
+>>> b = Compile(parser.Parser(lexer.Lexer("let x = 2; x * x;")).ParseProgram())
+>>> b.Instructions
+[0, 0, 13, 1, 1, 0, 12, 1, 12, 1, 4, 0, 17, 0]
+>>> b.Constants
+[2, 'x']
+>>> b = Compile(evaluator.prepare(parser.Parser(lexer.Lexer("function(x) {let y = x; y;}")).ParseProgram()))
+>>> fn = b.Constants[0]
+>>> fn.Code.Instructions
+[23, 0, 24, 1, 1, 0, 23, 1, 17, 0]
+>>> fn.Code.Names
+('x', 'y')
+"""
+
+import typing
+
+from . import ast
+from . import evaluator
+from . import tsobject
+from . import parser, lexer
+
+OP_CONST = 0
+OP_POP = 1
+# The infix opcodes are laid out in the same order as the ast.OP_* operator codes, so that
+# ``op - OP_ADD`` gives the operator code of any of them.
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+OP_LT = 6
+OP_GT = 7
+OP_EQ = 8
+OP_NEQ = 9
+OP_NEG = 10
+OP_NOT = 11
+OP_GET = 12
+OP_SET = 13
+OP_JMP = 14
+OP_JMPF = 15
+OP_CALL = 16
+OP_RET = 17
+OP_ARR = 18
+OP_IDX = 19
+OP_HASH = 20
+OP_CLOSURE = 21
+OP_HASHABLE = 22
+OP_GETL = 23
+OP_SETL = 24
+
+class Bytecode():
+	"""
+	The compiled form of a program or function body.
+	"""
+	__slots__ = ("Instructions", "Constants", "Names")
+
+	def __init__(self, Instructions: typing.List[int] = None, Constants: typing.List[typing.Any] = None, Names: typing.Tuple[str, ...] = ()):
+		self.Instructions = Instructions if Instructions else []
+		self.Constants = Constants if Constants else []
+		# The name bound to each local slot, indexed by slot.
+		self.Names = Names
+
+class CompiledFunction():
+	"""
+	The compiled form of a function literal, as stored in the constant pool.
+	"""
+	__slots__ = ("Literal", "Code")
+
+	def __init__(self, Literal: ast.FunctionLiteral, Code: Bytecode):
+		self.Literal = Literal
+		self.Code = Code
+
+class Compiler():
+	"""
+	Compiler is responsible for turning a single program or function body into Bytecode.
+
+	>>> c = Compiler()
+	>>> c.compile(parser.Parser(lexer.Lexer("if (true) {1} else {2}")).ParseProgram())
+	>>> c.Bytecode().Instructions
+	[0, 0, 15, 8, 0, 1, 14, 10, 0, 2, 17, 0]
+	>>> c.compile(None)
+	Traceback (most recent call last):
+		...
+	ValueError: cannot compile node of type NoneType
+	"""
+	def __init__(self, names: typing.Tuple[str, ...] = ()):
+		self.instructions: typing.List[int] = []
+		self.constants: typing.List[typing.Any] = []
+		self.constantIndices: typing.Dict[typing.Tuple[str, typing.Any], int] = {}
+		self.names = names
+
+	def Bytecode(self) -> Bytecode:
+		return Bytecode(Instructions=self.instructions, Constants=self.constants, Names=self.names)
+
+	def emit(self, op: int, operand: int = 0) -> int:
+		pos = len(self.instructions)
+		self.instructions.append(op)
+		self.instructions.append(operand)
+		return pos
+
+	def patch(self, pos: int, operand: int):
+		self.instructions[pos+1] = operand
+
+	def constant(self, key: typing.Tuple[str, typing.Any], value: typing.Any) -> int:
+		idx = self.constantIndices.get(key)
+		if idx is None:
+			idx = len(self.constants)
+			self.constants.append(value)
+			self.constantIndices[key] = idx
+		return idx
+
+	def compile(self, node: ast.Node):
+		method = _COMPILERS.get(type(node))
+		if method is None:
+			raise ValueError(f"cannot compile node of type {type(node).__name__}")
+		method(self, node)
+
+	def compileStatements(self, statements: typing.List[ast.Statement]):
+		"""
+		Compiles a list of statements so that, once they've run, exactly one value - that of
+		the last statement - is left on the stack.
+		"""
+		if not statements:
+			self.emit(OP_CONST, self.constant(("undefined", None), tsobject.UNDEFINED))
+			return
+
+		for i, statement in enumerate(statements):
+			if i:
+				self.emit(OP_POP)
+			self.compile(statement)
+
+	def compileProgram(self, node: ast.Program):
+		self.compileStatements(node.Statements)
+		self.emit(OP_RET)
+
+	def compileBlockStatement(self, node: ast.BlockStatement):
+		self.compileStatements(node.Statements)
+
+	def compileExpressionStatement(self, node: ast.ExpressionStatement):
+		self.compile(node.Expression)
+
+	def compileLetStatement(self, node: ast.LetStatement):
+		self.compile(node.Value)
+		if self.names and node.Name.Slot >= 0:
+			self.emit(OP_SETL, node.Name.Slot)
+		else:
+			self.emit(OP_SET, self.constant(("name", node.Name.Value), node.Name.Value))
+
+	def compileReturnStatement(self, node: ast.ReturnStatement):
+		self.compile(node.ReturnValue)
+		self.emit(OP_RET)
+
+	def compileIdentifier(self, node: ast.Identifier):
+		if self.names and node.Slot >= 0 and not node.Depth:
+			self.emit(OP_GETL, node.Slot)
+			return
+		self.emit(OP_GET, self.constant(("name", node.Value), node.Value))
+
+	def compileIntegerLiteral(self, node: ast.IntegerLiteral):
+		self.emit(OP_CONST, self.constant(("int", node.Value), tsobject.newInteger(node.Value)))
+
+	def compileStringLiteral(self, node: ast.StringLiteral):
+		self.emit(OP_CONST, self.constant(("str", node.Value), tsobject.String(Value=node.Value)))
+
+	def compileBoolean(self, node: ast.Boolean):
+		value = tsobject.TRUE if node.Value else tsobject.FALSE
+		self.emit(OP_CONST, self.constant(("bool", node.Value), value))
+
+	def compilePrefixExpression(self, node: ast.PrefixExpression):
+		self.compile(node.Right)
+		if node.Operator == "!":
+			self.emit(OP_NOT)
+		elif node.Operator == "-":
+			self.emit(OP_NEG)
+		else:
+			raise ValueError(f"unknown prefix operator: {node.Operator}")
+
+	def compileInfixExpression(self, node: ast.InfixExpression):
+		if node.OpCode == ast.OP_UNKNOWN:
+			raise ValueError(f"unknown infix operator: {node.Operator}")
+		self.compile(node.Left)
+		self.compile(node.Right)
+		self.emit(OP_ADD + node.OpCode)
+
+	def compileIfExpression(self, node: ast.IfExpression):
+		self.compile(node.Condition)
+		jumpToElse = self.emit(OP_JMPF)
+		self.compile(node.Consequence)
+		jumpToEnd = self.emit(OP_JMP)
+		self.patch(jumpToElse, len(self.instructions))
+		if node.Alternative is not None:
+			self.compile(node.Alternative)
+		else:
+			self.emit(OP_CONST, self.constant(("null", None), tsobject.NULL))
+		self.patch(jumpToEnd, len(self.instructions))
+
+	def compileFunctionLiteral(self, node: ast.FunctionLiteral):
+		names: typing.Tuple[str, ...] = ()
+		if node.Locals is not None:
+			names = tuple(sorted(node.Locals, key=node.Locals.get))
+		body = Compiler(names)
+		body.compileStatements(node.Body.Statements)
+		body.emit(OP_RET)
+		fn = CompiledFunction(Literal=node, Code=body.Bytecode())
+		self.emit(OP_CLOSURE, self.constant(("function", id(node)), fn))
+
+	def compileCallExpression(self, node: ast.CallExpression):
+		self.compile(node.Function)
+		for arg in node.Arguments:
+			self.compile(arg)
+		self.emit(OP_CALL, len(node.Arguments))
+
+	def compileArrayLiteral(self, node: ast.ArrayLiteral):
+		for elem in node.Elements:
+			self.compile(elem)
+		self.emit(OP_ARR, len(node.Elements))
+
+	def compileIndexExpression(self, node: ast.IndexExpression):
+		self.compile(node.Left)
+		self.compile(node.Index)
+		self.emit(OP_IDX)
+
+	def compileHashLiteral(self, node: ast.HashLiteral):
+		for k, v in zip(node.Keys, node.Values):
+			self.compile(k)
+			# Keys must be checked before their values are evaluated, but literal keys are
+			# always hashable.
+			if type(k) not in (ast.StringLiteral, ast.IntegerLiteral, ast.Boolean):
+				self.emit(OP_HASHABLE)
+			self.compile(v)
+		self.emit(OP_HASH, len(node.Keys))
+
+_COMPILERS: typing.Dict[type, typing.Callable[[Compiler, ast.Node], None]] = {
+	ast.Program: Compiler.compileProgram,
+	ast.BlockStatement: Compiler.compileBlockStatement,
+	ast.ExpressionStatement: Compiler.compileExpressionStatement,
+	ast.LetStatement: Compiler.compileLetStatement,
+	ast.ReturnStatement: Compiler.compileReturnStatement,
+	ast.Identifier: Compiler.compileIdentifier,
+	ast.IntegerLiteral: Compiler.compileIntegerLiteral,
+	ast.StringLiteral: Compiler.compileStringLiteral,
+	ast.Boolean: Compiler.compileBoolean,
+	ast.PrefixExpression: Compiler.compilePrefixExpression,
+	ast.InfixExpression: Compiler.compileInfixExpression,
+	ast.IfExpression: Compiler.compileIfExpression,
+	ast.FunctionLiteral: Compiler.compileFunctionLiteral,
+	ast.CallExpression: Compiler.compileCallExpression,
+	ast.ArrayLiteral: Compiler.compileArrayLiteral,
+	ast.IndexExpression: Compiler.compileIndexExpression,
+	ast.HashLiteral: Compiler.compileHashLiteral,
+}
+
+def Compile(program: ast.Program) -> Bytecode:
+	"""
+	Compiles an entire program.
+	"""
+	c = Compiler()
+	c.compile(program)
+	return c.Bytecode()
@@ -1,21 +1,79 @@
 import typing
 from . import tsobject
 
+# Marks a local slot whose variable hasn't been bound yet.
+UNSET = object()
+
+# Returned by dict lookups for names that aren't in a store.
+_MISSING = object()
+
 class Environment():
+	__slots__ = ("store", "outer", "slots", "names")
+
 	def __init__(self, outer: 'Environment' = None):
 		self.store: typing.Dict[str, tsobject.Object] = {}
 		self.outer: Environment = outer
+		# The local variable slots of a resolved function's call, and the names that map to
+		# them. Both are None for the global environment and unresolved functions.
+		self.slots: typing.Optional[typing.List[tsobject.Object]] = None
+		self.names: typing.Optional[typing.Dict[str, int]] = None
 
 	def Get(self, name: str) -> typing.Tuple[tsobject.Object, bool]:
 		"""
-		Retrieves an object from the environment.
+		Retrieves an object from the environment, searching enclosing environments outward
+		until the name is found.
+
+		>>> outer = Environment()
+		>>> _ = outer.Set("x", tsobject.Integer(Value=5))
+		>>> Environment(outer=Environment(outer=outer)).Get("x")
+		(5, True)
+		>>> Environment(outer=outer).Get("y")
+		(None, False)
+		>>> local = Environment(outer=outer)
+		>>> local.names, local.slots = {"x": 0, "y": 1}, [UNSET, tsobject.Integer(Value=6)]
+		>>> local.Get("x")
+		(5, True)
+		>>> local.Get("y")
+		(6, True)
 		"""
-		if name in self.store:
-			return self.store[name], True
-		if self.outer:
-			return self.outer.Get(name)
+		env = self
+		while env is not None:
+			val = env.store.get(name, _MISSING)
+			if val is not _MISSING:
+				return val, True
+			names = env.names
+			if names is not None:
+				slot = names.get(name)
+				if slot is not None:
+					val = env.slots[slot]
+					if val is not UNSET:
+						return val, True
+			env = env.outer
 		return None, False
 
+	def GetAt(self, depth: int, slot: int) -> tsobject.Object:
+		"""
+		Retrieves the object in the given local slot of the environment ``depth`` levels out
+		from this one, or UNSET if that slot hasn't been bound (or the environment has no
+		slots).
+
+		>>> outer = Environment()
+		>>> outer.slots = [tsobject.Integer(Value=5), UNSET]
+		>>> Environment(outer=Environment(outer=outer)).GetAt(2, 0)
+		5
+		>>> Environment(outer=outer).GetAt(1, 1) is UNSET
+		True
+		>>> Environment(outer=Environment()).GetAt(1, 0) is UNSET
+		True
+		"""
+		env = self
+		for _ in range(depth):
+			env = env.outer
+		slots = env.slots
+		if slots is None:
+			return UNSET
+		return slots[slot]
+
 	def Set(self, name: str, val: tsobject.Object) -> tsobject.Object:
 		self.store[name] = val
 		return val
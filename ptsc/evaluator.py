@@ -11,18 +11,41 @@ This package contains the evaluator logic for the language.
 'undefined'
 """
 
+import functools
+import operator
 import typing
 
 from . import ast
 from . import environment
 from . import tsobject
+from . import tstoken
 from . import builtins
 from . import parser, lexer
 
-NULL = tsobject.Null()
-UNDEFINED = tsobject.Object()
-TRUE = tsobject.Boolean(Value=True)
-FALSE = tsobject.Boolean(Value=False)
+NULL = tsobject.NULL
+UNDEFINED = tsobject.UNDEFINED
+TRUE = tsobject.TRUE
+FALSE = tsobject.FALSE
+
+_mkint = tsobject.newInteger
+_UNSET = environment.UNSET
+
+_IntCls = tsobject.Integer
+_StrCls = tsobject.String
+_ErrCls = tsobject.Error
+_BoolCls = tsobject.Boolean
+_ArrCls = tsobject.Array
+_HashCls = tsobject.Hash
+_RetCls = tsobject.ReturnValue
+_InfixCls = ast.InfixExpression
+_IntLitCls = ast.IntegerLiteral
+_IdentCls = ast.Identifier
+_ExpressionStatement = ast.ExpressionStatement
+_FUNCTION_OBJ = tsobject.ObjectType.FUNCTION_OBJ
+_BUILTIN_OBJ = tsobject.ObjectType.BUILTIN_OBJ
+_TAIL_CALL_OBJ = tsobject.ObjectType.TAIL_CALL_OBJ
+_OP_ADD, _OP_SUB, _OP_MUL, _OP_DIV = ast.OP_ADD, ast.OP_SUB, ast.OP_MUL, ast.OP_DIV
+_OP_LT, _OP_GT, _OP_EQ, _OP_NOT_EQ = ast.OP_LT, ast.OP_GT, ast.OP_EQ, ast.OP_NOT_EQ
 
 def Eval(node: ast.Node, env: environment.Environment) -> typing.Optional[tsobject.Object]:
 	"""
@@ -64,92 +87,497 @@ def Eval(node: ast.Node, env: environment.Environment) -> typing.Optional[tsobje
 	4
 	>>> arr[2]
 	6
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (true) {10}")).ParseProgram(), environment.Environment()).Value
+	10
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (false) {10}")).ParseProgram(), environment.Environment())
+	null
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (1) {10}")).ParseProgram(), environment.Environment()).Value
+	10
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (1<2) {10};")).ParseProgram(), environment.Environment()).Value
+	10
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (1>2) {10};")).ParseProgram(), environment.Environment())
+	null
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (1>2) {10} else {20}")).ParseProgram(), environment.Environment()).Value
+	20
+	>>> evalProgram(parser.Parser(lexer.Lexer("if (1<2) {10} else {20};")).ParseProgram(), environment.Environment()).Value
+	10
+	>>> evalProgram(parser.Parser(lexer.Lexer("let f = function(n) { if (n < 1) { return 0; } return n + f(n - 1); }; f(100);")).ParseProgram(), environment.Environment()).Value
+	5050
 	"""
-	if isinstance(node, ast.Program):
-		return evalProgram(node, env)
-
-	if isinstance(node, ast.BlockStatement):
-		return evalBlockStatement(node, env)
-
-	if isinstance(node, ast.ExpressionStatement):
-		return Eval(node.Expression, env)
-
-	if isinstance(node, ast.ReturnStatement):
-		val = Eval(node.ReturnValue, env)
-		if isError(val):
-			return val
-		return tsobject.ReturnValue(Value=val)
+	nodeType = type(node)
+
+	# The node types that an interpreted function call recurses through are evaluated inline
+	# here, rather than dispatched through _DISPATCH, so that each call costs as few Python
+	# frames as possible; every extra one lowers how deeply a program can recurse before it
+	# hits Python's recursion limit. Everything else goes through the table.
+	if nodeType is _IdentCls:
+		# A bound local of the current function is read straight from its slot.
+		slot = node.Slot
+		if slot >= 0 and not node.Depth:
+			slots = env.slots
+			if slots is not None:
+				val = slots[slot]
+				if val is not _UNSET:
+					return val
+		return evalIdentifier(node, env)
 
-	if isinstance(node, ast.LetStatement):
-		val = Eval(node.Value, env)
-		if isError(val):
-			return val
-		env.Set(node.Name.Value, val)
+	if nodeType is ast.InfixExpression:
+		op = node.OpCode
+		if 0 <= op <= _OP_DIV:
+			result = _evalArithmetic(node, env)
+			cls = result.__class__
+			if cls is int or cls is float:
+				return _mkint(result)
+			return result
+
+		left, right = node.Left, node.Right
+		left = left.Value if left.__class__ is _IntLitCls else Eval(left, env)
+		lcls = left.__class__
+		if lcls is _ErrCls:
+			return left
+		right = right.Value if right.__class__ is _IntLitCls else Eval(right, env)
+		rcls = right.__class__
+		if rcls is _ErrCls:
+			return right
 
-	if isinstance(node, ast.IntegerLiteral):
-		return tsobject.Integer(Value=node.Value)
+		if lcls is _IntCls:
+			left = left.Value
+			lcls = left.__class__
+		if rcls is _IntCls:
+			right = right.Value
+			rcls = right.__class__
+		if (lcls is int or lcls is float) and (rcls is int or rcls is float):
+			if op == _OP_LT:
+				return TRUE if left < right else FALSE
+			if op == _OP_GT:
+				return TRUE if left > right else FALSE
+			if op == _OP_EQ:
+				return TRUE if left == right else FALSE
+			if op == _OP_NOT_EQ:
+				return TRUE if left != right else FALSE
+		return _evalBoxedInfix(node, left, right)
+
+	if nodeType is ast.CallExpression:
+		fn = Eval(node.Function, env)
+		if fn.__class__ is _ErrCls:
+			return fn
 
-	if isinstance(node, ast.StringLiteral):
-		return tsobject.String(Value=node.Value)
+		args, err = evalExpressions(node.Arguments, env)
+		if err is not None:
+			return err
 
-	if isinstance(node, ast.Boolean):
-		return nativeBoolToBooleanObject(node.Value)
+		return applyFunction(fn, args)
 
-	if isinstance(node, ast.PrefixExpression):
-		right = Eval(node.Right, env)
-		if isError(right):
-			return right
-		return evalPrefixExpression(node.Operator, right)
+	if nodeType is ast.ReturnStatement:
+		if node.Tail:
+			call = node.ReturnValue
+			fn = Eval(call.Function, env)
+			if fn.__class__ is _ErrCls:
+				return fn
+			args, err = evalExpressions(call.Arguments, env)
+			if err is not None:
+				return err
+			return _TailCall(fn, args)
 
-	if isinstance(node, ast.InfixExpression):
-		left = Eval(node.Left, env)
-		if isError(left):
-			return left
+		val = Eval(node.ReturnValue, env)
+		if val.__class__ is _ErrCls:
+			return val
+		return tsobject.ReturnValue(Value=val)
 
-		right = Eval(node.Right, env)
-		if isError(right):
-			return right
-		return evalInfixExpression(node.Operator, left, right)
+	if nodeType is ast.IfExpression:
+		condition = Eval(node.Condition, env)
+		if condition.__class__ is _ErrCls:
+			return condition
+
+		# Truthiness, inlined: only null, false and undefined are falsy.
+		if condition is not NULL and condition is not FALSE and condition is not UNDEFINED:
+			node = node.Consequence
+		elif node.Alternative is not None:
+			node = node.Alternative
+		else:
+			return NULL
+		nodeType = type(node)
+
+	if nodeType is ast.BlockStatement:
+		res = UNDEFINED
+
+		for stmt in node.Statements:
+			if stmt.__class__ is _ExpressionStatement:
+				stmt = stmt.Expression
+			res = Eval(stmt, env)
+
+			resCls = res.__class__
+			if resCls is _RetCls or resCls is _ErrCls or resCls is _TailCall:
+				return res
 
-	if isinstance(node, ast.IfExpression):
-		return evalIfExpression(node, env)
+		return res
 
-	if isinstance(node, ast.Identifier):
-		return evalIdentifier(node, env)
+	handler = _handlerFor(nodeType)
+	if handler is None:
+		return None
+	return handler(node, env)
 
-	if isinstance(node, ast.FunctionLiteral):
-		return tsobject.Function(Parameters=node.Parameters, Env=env, Body=node.Body)
+class _TailCall(tsobject.Object):
+	"""
+	The result of a tail call's return statement: the function to call and its arguments,
+	which applyFunction calls in place of the function that returned it, rather than
+	recursing. It propagates out of blocks just like a ReturnValue, but has its own Type and no
+	Value, and is always consumed by applyFunction's loop.
+	"""
+	__slots__ = ("Fn", "Args")
 
-	if isinstance(node, ast.CallExpression):
-		fn = Eval(node.Function, env)
-		if isError(fn):
-			return fn
+	def __init__(self, Fn: tsobject.Object, Args: typing.List[tsobject.Object]):
+		self.Type = _TAIL_CALL_OBJ
+		self.Fn = Fn
+		self.Args = Args
 
-		args = evalExpressions(node.Arguments, env)
-		if len(args) == 1 and isError(args[0]):
-			return args[0]
+def _evalLetStatement(node: ast.LetStatement, env: environment.Environment) -> None:
+	val = Eval(node.Value, env)
+	if val.__class__ is _ErrCls:
+		return val
+	slot = node.Name.Slot
+	if slot >= 0 and env.slots is not None:
+		env.slots[slot] = val
+	else:
+		env.Set(node.Name.Value, val)
 
-		return applyFunction(fn, *args)
+def _evalPrefix(node: ast.PrefixExpression, env: environment.Environment) -> tsobject.Object:
+	right = Eval(node.Right, env)
+	if right.__class__ is _ErrCls:
+		return right
+	return evalPrefixExpression(node.Operator, right)
 
-	if isinstance(node, ast.ArrayLiteral):
-		elems = evalExpressions(node.Elements, env)
-		if len(elems) == 1 and isError(elems[0]):
-			return elems[0]
-		return tsobject.Array(Elements=elems)
+def _evalArithmetic(node: ast.InfixExpression, env: environment.Environment) -> typing.Any:
+	"""
+	Evaluates an arithmetic (+, -, * or /) infix expression, returning a plain Python number if
+	both operands are integers and otherwise the resulting object.
 
-	if isinstance(node, ast.IndexExpression):
-		left = Eval(node.Left, env)
-		if isError(left):
-			return left
-		index = Eval(node.Index, env)
-		if isError(index):
-			return index
-		return evalIndexExpression(left, index)
+	>>> p = parser.Parser(lexer.Lexer("let a = 3; a * a + a - 1;")).ParseProgram()
+	>>> env = environment.Environment()
+	>>> Eval(p.Statements[0], env)
+	>>> _evalArithmetic(p.Statements[1].Expression, env)
+	11
+	>>> p = parser.Parser(lexer.Lexer("let b = true; b * 2 + 1;")).ParseProgram()
+	>>> Eval(p.Statements[0], env)
+	>>> _evalArithmetic(p.Statements[1].Expression, env)
+	ERROR: type mismatch: BOOLEAN * INTEGER
+	>>> p = parser.Parser(lexer.Lexer('let s = "a"; s + "b" + "c" - 1;')).ParseProgram()
+	>>> Eval(p.Statements[0], env)
+	>>> _evalArithmetic(p.Statements[1].Expression, env)
+	ERROR: type mismatch: STRING - INTEGER
+	>>> p = parser.Parser(lexer.Lexer('s + s + "b" + s;')).ParseProgram()
+	>>> _evalArithmetic(p.Statements[0].Expression, env)
+	aaba
+	>>> p = parser.Parser(lexer.Lexer(" + ".join(["a"] * 5000) + ";")).ParseProgram()
+	>>> _evalArithmetic(p.Statements[0].Expression, env)
+	15000
+	>>> evalProgram(parser.Parser(lexer.Lexer("let x = 1; let f = function(a) {let y = a + x; let x = 5; a + x * y;}; f(2);")).ParseProgram(), environment.Environment())
+	17
+	>>> evalProgram(parser.Parser(lexer.Lexer("let f = function(n) { if (n < 1) { return 0; } return 2 * n + f(n - 1) - n; }; f(100);")).ParseProgram(), environment.Environment())
+	5050
+	"""
+	# Chains like a+b-c*d nest to the left, so the left spine is walked in a loop and the
+	# operators applied on the way back up, instead of recursing once per operator.
+	spine = [node]
+	left = node.Left
+	while left.__class__ is _InfixCls and 0 <= left.OpCode <= _OP_DIV:
+		spine.append(left)
+		left = left.Left
+
+	spine.reverse()
+	operand = left
+	left = None
+	# Runs of string concatenation collect their parts here and are joined once at the end,
+	# rather than copying the string built so far at each step.
+	parts = None
+	for i in range(len(spine) + 1):
+		# Integer literals and bound locals are read here, and only compound operands recurse,
+		# straight into _evalArithmetic or Eval: each frame added between an interpreted call
+		# and the next lowers how deeply programs can recurse. Integer results are unboxed.
+		cls = operand.__class__
+		if cls is _IntLitCls:
+			right = operand.Value
+		elif cls is _InfixCls and 0 <= operand.OpCode <= _OP_DIV:
+			right = _evalArithmetic(operand, env)
+		else:
+			right = _UNSET
+			if cls is _IdentCls and operand.Slot >= 0 and not operand.Depth and env.slots is not None:
+				right = env.slots[operand.Slot]
+			if right is _UNSET:
+				right = Eval(operand, env)
+			if right.__class__ is _IntCls:
+				right = right.Value
+		rcls = right.__class__
+		if rcls is _ErrCls:
+			return right
 
-	if isinstance(node, ast.HashLiteral):
-		return evalHashLiteral(node, env)
+		if i < len(spine):
+			operand = spine[i].Right
+		if not i:
+			left = right
+			continue
+		node = spine[i - 1]
+
+		op = node.OpCode
+		if parts is not None:
+			if rcls is _StrCls and op == _OP_ADD:
+				parts.append(right.Value)
+				continue
+			left = tsobject.String(Value="".join(parts))
+			parts = None
+
+		lcls = left.__class__
+		if (lcls is int or lcls is float) and (rcls is int or rcls is float):
+			if op == _OP_ADD:
+				left = left + right
+			elif op == _OP_SUB:
+				left = left - right
+			elif op == _OP_MUL:
+				left = left * right
+			else:
+				left = left / right
+		elif lcls is _StrCls and rcls is _StrCls and op == _OP_ADD:
+			parts = [left.Value, right.Value]
+		else:
+			left = _evalBoxedInfix(node, left, right)
+			if left.__class__ is _ErrCls:
+				return left
+
+	if parts is not None:
+		return tsobject.String(Value="".join(parts))
+	return left
+
+def _evalBoxedInfix(node: ast.InfixExpression, left: typing.Any, right: typing.Any) -> tsobject.Object:
+	cls = left.__class__
+	if cls is int or cls is float:
+		left = _mkint(left)
+	cls = right.__class__
+	if cls is int or cls is float:
+		right = _mkint(right)
+	return evalInfixExpression(node.Operator, left, right)
+
+def _evalExpressionStatement(node: ast.ExpressionStatement, env: environment.Environment) -> typing.Optional[tsobject.Object]:
+	return Eval(node.Expression, env)
+
+# Integer and String objects are never mutated, so each literal node only ever needs one.
+def _evalInteger(node: ast.IntegerLiteral, env: environment.Environment) -> tsobject.Integer:
+	obj = node.Object
+	if obj is None:
+		obj = node.Object = _mkint(node.Value)
+	return obj
+
+def _evalString(node: ast.StringLiteral, env: environment.Environment) -> tsobject.String:
+	"""
+	>>> lit = parser.Parser(lexer.Lexer('"foo"')).ParseProgram().Statements[0].Expression
+	>>> _evalString(lit, None) is _evalString(lit, None)
+	True
+	"""
+	obj = node.Object
+	if obj is None:
+		obj = node.Object = tsobject.String(Value=node.Value)
+	return obj
+
+def _evalBoolean(node: ast.Boolean, env: environment.Environment) -> tsobject.Boolean:
+	return TRUE if node.Value else FALSE
+
+def _evalFunction(node: ast.FunctionLiteral, env: environment.Environment) -> tsobject.Function:
+	return tsobject.Function(Parameters=node.Parameters, Env=env, Body=node.Body, Locals=node.Locals, NumLocals=node.NumLocals, Literal=node)
+
+def _evalArray(node: ast.ArrayLiteral, env: environment.Environment) -> tsobject.Object:
+	elems, err = evalExpressions(node.Elements, env)
+	if err is not None:
+		return err
+	return tsobject.Array(Elements=elems)
+
+def _evalIndex(node: ast.IndexExpression, env: environment.Environment) -> tsobject.Object:
+	left = Eval(node.Left, env)
+	if left.__class__ is _ErrCls:
+		return left
+	index = Eval(node.Index, env)
+	if index.__class__ is _ErrCls:
+		return index
+	return evalIndexExpression(left, index)
+
+# The attributes of each node type that hold a single child node, or a list of them, for the
+# fold and resolve passes.
+_CHILDREN: typing.Dict[type, typing.Tuple[str, ...]] = {
+	ast.LetStatement: ("Name", "Value"),
+	ast.ReturnStatement: ("ReturnValue",),
+	ast.ExpressionStatement: ("Expression",),
+	ast.PrefixExpression: ("Right",),
+	ast.InfixExpression: ("Left", "Right"),
+	ast.IfExpression: ("Condition", "Consequence", "Alternative"),
+	ast.FunctionLiteral: ("Body",),
+	ast.CallExpression: ("Function",),
+	ast.IndexExpression: ("Left", "Index"),
+}
+_CHILD_LISTS: typing.Dict[type, str] = {
+	ast.Program: "Statements",
+	ast.BlockStatement: "Statements",
+	ast.CallExpression: "Arguments",
+	ast.ArrayLiteral: "Elements",
+}
+_LITERALS = (ast.IntegerLiteral, ast.StringLiteral, ast.Boolean)
+
+def fold(node: ast.Node) -> ast.Node:
+	"""
+	Folds constant subexpressions - prefix and infix expressions whose operands are all
+	literals - into single literal nodes, in place, and returns the folded node.
+
+	Folding uses the evaluator's own semantics, so expressions that would produce an error
+	(or raise, like division by zero) are left alone to fail at run-time as usual. Because the
+	tree is folded in place, function values print their folded bodies.
+
+	>>> evalProgram(parser.Parser(lexer.Lexer("function(x) {x * 2 + 3 * 4}")).ParseProgram(), environment.Environment())
+	function(x) {
+	((x * 2) + 12)
+	}
+	>>> str(fold(parser.Parser(lexer.Lexer("let a = 5+5+5+5-10; a * (2 * 3);")).ParseProgram()))
+	'let a = 10;(a * 6)'
+	>>> str(fold(parser.Parser(lexer.Lexer("(5+10*2+15/3)*2+-10;")).ParseProgram()))
+	'50.0'
+	>>> str(fold(parser.Parser(lexer.Lexer('if (1 < 2 == !false) {"a" + "b"} else {-true}')).ParseProgram()))
+	'iftrue abelse (-true)'
+	>>> str(fold(parser.Parser(lexer.Lexer("1/0; 5+true;")).ParseProgram()))
+	'(1 / 0)(5 + true)'
+	"""
+	nodeType = type(node)
+	for attr in _CHILDREN.get(nodeType, ()):
+		child = getattr(node, attr)
+		if child is not None:
+			setattr(node, attr, fold(child))
+
+	attr = _CHILD_LISTS.get(nodeType)
+	if attr is not None:
+		setattr(node, attr, [fold(child) for child in getattr(node, attr)])
+	elif nodeType is ast.HashLiteral:
+		node.Keys = [fold(k) for k in node.Keys]
+		node.Values = [fold(v) for v in node.Values]
+	elif nodeType is ast.InfixExpression:
+		if type(node.Left) in _LITERALS and type(node.Right) in _LITERALS:
+			return _literalOf(node)
+	elif nodeType is ast.PrefixExpression:
+		if type(node.Right) in _LITERALS:
+			return _literalOf(node)
+	return node
+
+def _children(node: ast.Node) -> typing.Iterator[ast.Node]:
+	nodeType = type(node)
+	for attr in _CHILDREN.get(nodeType, ()):
+		child = getattr(node, attr)
+		if child is not None:
+			yield child
+
+	attr = _CHILD_LISTS.get(nodeType)
+	if attr is not None:
+		yield from getattr(node, attr)
+	elif nodeType is ast.HashLiteral:
+		for k, v in zip(node.Keys, node.Values):
+			yield k
+			yield v
+
+def _letNames(node: ast.Node) -> typing.Iterator[str]:
+	"""
+	Yields the names bound by let statements anywhere under the given node, except within
+	nested function literals.
+	"""
+	for child in _children(node):
+		if type(child) is ast.LetStatement:
+			yield child.Name.Value
+		if type(child) is not ast.FunctionLiteral:
+			yield from _letNames(child)
 
-	return None
+def resolve(node: ast.Node, scopes: typing.Tuple[typing.Dict[str, int], ...] = ()):
+	"""
+	Assigns each function's parameters and local variables to numbered slots, and annotates
+	every Identifier that refers to a local of its own function, or of an enclosing function,
+	with that slot and the number of functions out it lives (its Depth), so it can be found
+	without any name lookups. Blocks don't introduce scopes, so a let anywhere in a function's
+	body - even inside a conditional - binds one of that function's locals.
+
+	Names at the top level of the program are left to be looked up by name.
+
+	>>> p = parser.Parser(lexer.Lexer("let f = function(x, y) {let z = x; if (y) {let w = z;} g;};")).ParseProgram()
+	>>> resolve(p)
+	>>> f = p.Statements[0].Value
+	>>> f.Locals, f.NumLocals
+	({'x': 0, 'y': 1, 'z': 2, 'w': 3}, 4)
+	>>> p.Statements[0].Name.Slot, f.Body.Statements[0].Value.Slot, f.Body.Statements[2].Expression.Slot
+	(-1, 0, -1)
+	>>> p = parser.Parser(lexer.Lexer("function(x) {let y = 1; function(z) {function() {x + y + z}}};")).ParseProgram()
+	>>> resolve(p)
+	>>> xyz = p.Statements[0].Expression.Body.Statements[1].Expression.Body.Statements[0].Expression.Body.Statements[0].Expression
+	>>> [(i.Depth, i.Slot) for i in (xyz.Left.Left, xyz.Left.Right, xyz.Right)]
+	[(2, 0), (2, 1), (1, 0)]
+	"""
+	nodeType = type(node)
+	if nodeType is ast.Identifier:
+		name = node.Value
+		depth = 0
+		for locals in reversed(scopes):
+			slot = locals.get(name)
+			if slot is not None:
+				node.Depth = depth
+				node.Slot = slot
+				return
+			depth += 1
+		node.Slot = -1
+		return
+
+	if nodeType is ast.FunctionLiteral:
+		locals = {}
+		for i, p in enumerate(node.Parameters):
+			locals[p.Value] = i
+			p.Slot = i
+		numLocals = len(node.Parameters)
+		for name in _letNames(node.Body):
+			if name not in locals:
+				locals[name] = numLocals
+				numLocals += 1
+		node.Locals = locals
+		node.NumLocals = numLocals
+		_markTailCalls(node.Body)
+		resolve(node.Body, scopes + (locals,))
+		return
+
+	for child in _children(node):
+		resolve(child, scopes)
+
+def _markTailCalls(block: ast.BlockStatement):
+	"""
+	Marks the return statements of calls in a function body that are in tail position: those
+	directly in the body, or in the blocks of a conditional that is itself a statement in such
+	a position. (A return inside a conditional used as a value doesn't return from the
+	function.)
+	"""
+	for stmt in block.Statements:
+		stmtType = type(stmt)
+		if stmtType is ast.ReturnStatement:
+			stmt.Tail = type(stmt.ReturnValue) is ast.CallExpression
+		elif stmtType is ast.ExpressionStatement and type(stmt.Expression) is ast.IfExpression:
+			_markTailCalls(stmt.Expression.Consequence)
+			if stmt.Expression.Alternative is not None:
+				_markTailCalls(stmt.Expression.Alternative)
+
+def _literalOf(node: ast.Expression) -> ast.Expression:
+	"""
+	Evaluates a constant expression and returns a literal node for the result, or the node
+	itself if it can't be evaluated ahead of time.
+	"""
+	try:
+		result = Eval(node, None)
+	except ZeroDivisionError:
+		return node
+
+	resultCls = result.__class__
+	if resultCls is _IntCls:
+		return ast.IntegerLiteral(Value=result.Value, Token=tstoken.Token(Type=tstoken.TokenType.INT, Literal=str(result.Value)))
+	if resultCls is _StrCls:
+		return ast.StringLiteral(Value=result.Value, Token=tstoken.Token(Type=tstoken.TokenType.STRING, Literal=result.Value))
+	if resultCls is _BoolCls:
+		tokenType = tstoken.TokenType.TRUE if result.Value else tstoken.TokenType.FALSE
+		return ast.Boolean(Value=result.Value, Token=tstoken.Token(Type=tokenType, Literal=result.Inspect()))
+	return node
 
 def evalProgram(program: ast.Program, env: environment.Environment) -> tsobject.Object:
 	"""
@@ -188,27 +616,79 @@ def evalProgram(program: ast.Program, env: environment.Environment) -> tsobject.
 	>>> evalProgram(parser.Parser(lexer.Lexer("")).ParseProgram(), environment.Environment())
 	undefined
 	"""
-	res = tsobject.Object()
+	return runProgram(prepare(program), env)
 
-	for statement in program.Statements:
-		res = Eval(statement, env)
-
-		if isinstance(res, tsobject.ReturnValue):
-			return res.Value
-		if isinstance(res, tsobject.Error):
-			return res
-
-	return res
+def prepare(program: ast.Program) -> ast.Program:
+	"""
+	Folds and resolves a program in place, readying it for runProgram, and returns it.
+	"""
+	fold(program)
+	resolve(program)
+	return program
 
-def evalBlockStatement(block: ast.BlockStatement, env: environment.Environment) -> tsobject.Object:
-	res = tsobject.Object()
+@functools.lru_cache(maxsize=256)
+def Parse(src: str) -> typing.Tuple[ast.Program, typing.Tuple[str, ...]]:
+	"""
+	Parses and prepares a program's source, returning the program and any parser errors (in
+	which case the program isn't prepared). Results are cached by source, so the returned
+	program is shared between callers. Evaluating it does write to its nodes - call
+	counts and compiled kernels on function literals (FunctionLiteral.Calls and Kernel), the
+	objects for literals (IntegerLiteral.Object and StringLiteral.Object) and prepared keys on
+	hash literals (HashLiteral.Prepared) - but none of these depend on the environment the
+	program runs in, so sharing it between runs is safe.
+
+	>>> Parse("1 + 2;") is Parse("1 + 2;")
+	True
+	>>> Parse("let 5;")[1]
+	('expected next tstoken to be TokenType.IDENT, got TokenType.INT instead',)
+	"""
+	p = parser.Parser(lexer.Lexer(src))
+	program = p.ParseProgram()
+	errors = tuple(p.errors)
+	if not errors:
+		prepare(program)
+	return program, errors
+
+def Run(src: str, env: environment.Environment) -> tsobject.Object:
+	"""
+	Parses (or fetches from the cache) and evaluates a program's source, with a given
+	environment.
+
+	>>> env = environment.Environment()
+	>>> Run("let double = function(x) {x * 2}; double(4);", env)
+	8
+	>>> Run("double(4);", env)
+	8
+	>>> Run("let 5;", env)
+	ERROR: expected next tstoken to be TokenType.IDENT, got TokenType.INT instead
+	"""
+	program, errors = Parse(src)
+	if errors:
+		return newError("\n".join(errors))
+	return runProgram(program, env)
 
-	for stmt in block.Statements:
-		res = Eval(stmt, env)
+def runProgram(program: ast.Program, env: environment.Environment) -> tsobject.Object:
+	"""
+	Evaluates a program that has already been prepared, with a given environment.
+	"""
+	res = UNDEFINED
+	# Everything the loop uses is bound to locals up front, and statements are dispatched
+	# directly rather than through Eval.
+	dispatch = _DISPATCH.get
+	ExpressionStatement, RetCls, ErrCls = _ExpressionStatement, _RetCls, _ErrCls
 
-		if res is not None:
-			if res.Type == tsobject.ObjectType.RETURN_VALUE_OBJ or res.Type == tsobject.ObjectType.ERROR_OBJ:
-				return res
+	for statement in program.Statements:
+		# Unwrapping expression statements here saves a trip through Eval for each one.
+		if statement.__class__ is ExpressionStatement:
+			statement = statement.Expression
+		handler = dispatch(statement.__class__)
+		res = handler(statement, env) if handler is not None else None
+
+		resCls = res.__class__
+		if resCls is RetCls:
+			return res.Value
+		if resCls is ErrCls:
+			return res
 
 	return res
 
@@ -239,6 +719,8 @@ def evalPrefixExpression(operator: str, right: tsobject.Object) -> tsobject.Obje
 	False
 	>>> evalProgram(parser.Parser(lexer.Lexer("!!5;")).ParseProgram(), environment.Environment()).Value
 	True
+	>>> evalProgram(parser.Parser(lexer.Lexer("![][0];")).ParseProgram(), environment.Environment()).Value
+	True
 	"""
 	if operator == "!":
 		return evalBangOperatorExpression(right)
@@ -285,49 +767,80 @@ def evalInfixExpression(operator: str, left: tsobject.Object, right: tsobject.Ob
 	>>> evalProgram(parser.Parser(lexer.Lexer("(1 > 2) == false;")).ParseProgram(), environment.Environment()).Value
 	True
 	"""
-	if left.Type == tsobject.ObjectType.INTEGER_OBJ and right.Type == tsobject.ObjectType.INTEGER_OBJ:
+	leftCls, rightCls = left.__class__, right.__class__
+	if leftCls is _IntCls and rightCls is _IntCls:
 		return evalIntegerInfixExpression(operator, left, right)
-	if left.Type == tsobject.ObjectType.STRING_OBJ and right.Type == tsobject.ObjectType.STRING_OBJ:
+	if leftCls is _StrCls and rightCls is _StrCls:
 		return evalStringInfixExpression(operator, left, right)
 	if operator == "==":
 		return nativeBoolToBooleanObject(left == right)
 	if operator == "!=":
 		return nativeBoolToBooleanObject(left != right)
-	if left.Type != right.Type:
+	if left.Type is not right.Type:
 		return newError(f"type mismatch: {left.Type} {operator} {right.Type}")
 	return newError(f"unknown operator: {left.Type} {operator} {right.Type}")
 
 def evalBangOperatorExpression(right: tsobject.Object) -> tsobject.Object:
-	if right is FALSE or right is NULL:
+	if right is FALSE or right is NULL or right is UNDEFINED:
 		return TRUE
 	return FALSE
 
 def evalMinusPrefixOperatorExpression(right: tsobject.Object) -> tsobject.Object:
-	if right.Type != tsobject.ObjectType.INTEGER_OBJ:
+	if right.__class__ is not _IntCls:
 		return newError(f"unknown operator: -{right.Type}")
-	return tsobject.Integer(Value=-right.Value)
+	return _mkint(-right.Value)
+
+# The Python operators for each integer operator, indexed by ast.OP_* operator code.
+_BINOPS: typing.Tuple[typing.Callable[[int, int], typing.Any], ...] = (
+	operator.add,
+	operator.sub,
+	operator.mul,
+	operator.truediv,
+	operator.lt,
+	operator.gt,
+	operator.eq,
+	operator.ne,
+)
+
+def intBinop(op: int, lvalue: int, rvalue: int) -> typing.Any:
+	"""
+	Applies the operator identified by the opcode ``op`` to two plain Python
+	integers, returning a plain Python number or bool - or ``None`` if the
+	opcode isn't one that applies to integers.
 
-def evalIntegerInfixExpression(operator: str, left: tsobject.Object, right: tsobject.Object) -> tsobject.Object:
-	lvalue, rvalue = left.Value, right.Value
+	>>> intBinop(ast.OP_ADD, 2, 3)
+	5
+	>>> intBinop(ast.OP_DIV, 6, 4)
+	1.5
+	>>> intBinop(ast.OP_LT, 2, 3)
+	True
+	>>> intBinop(ast.OP_UNKNOWN, 2, 3) is None
+	True
+	"""
+	if 0 <= op < len(_BINOPS):
+		return _BINOPS[op](lvalue, rvalue)
+	return None
 
-	if operator == "+":
-		return tsobject.Integer(Value=lvalue+rvalue)
-	if operator == "-":
-		return tsobject.Integer(Value=lvalue-rvalue)
-	if operator == "*":
-		return tsobject.Integer(Value=lvalue*rvalue)
-	if operator == "/":
-		return tsobject.Integer(Value=lvalue/rvalue)
-	if operator == "<":
-		return nativeBoolToBooleanObject(lvalue < rvalue)
-	if operator == ">":
-		return nativeBoolToBooleanObject(lvalue > rvalue)
-	if operator == "==":
-		return nativeBoolToBooleanObject(lvalue == rvalue)
-	if operator == "!=":
-		return nativeBoolToBooleanObject(lvalue != rvalue)
+# The handlers for each integer operator, indexed by ast.OP_* operator code.
+_INT_OPS: typing.Tuple[typing.Callable[[int, int], tsobject.Object], ...] = (
+	lambda lvalue, rvalue: _mkint(lvalue + rvalue),
+	lambda lvalue, rvalue: _mkint(lvalue - rvalue),
+	lambda lvalue, rvalue: _mkint(lvalue * rvalue),
+	lambda lvalue, rvalue: tsobject.Integer(Value=lvalue / rvalue),
+	lambda lvalue, rvalue: TRUE if lvalue < rvalue else FALSE,
+	lambda lvalue, rvalue: TRUE if lvalue > rvalue else FALSE,
+	lambda lvalue, rvalue: TRUE if lvalue == rvalue else FALSE,
+	lambda lvalue, rvalue: TRUE if lvalue != rvalue else FALSE,
+)
+
+def evalIntegerOpCode(op: int, operator: str, left: tsobject.Object, right: tsobject.Object) -> tsobject.Object:
+	if 0 <= op < len(_INT_OPS):
+		return _INT_OPS[op](left.Value, right.Value)
 	return newError(f"unknown operator: {left.Type} {operator} {right.Type}")
 
+def evalIntegerInfixExpression(operator: str, left: tsobject.Object, right: tsobject.Object) -> tsobject.Object:
+	return evalIntegerOpCode(ast.OPCODES.get(operator, ast.OP_UNKNOWN), operator, left, right)
+
 def evalStringInfixExpression(operator: str, left: tsobject.Object, right: tsobject.Object) -> tsobject.Object:
 	"""
 	Evaluates a string infix expression, e.g. '"Hello "+"World!"'
@@ -340,48 +853,41 @@ def evalStringInfixExpression(operator: str, left: tsobject.Object, right: tsobj
 
 	return tsobject.String(Value=left.Value + right.Value)
 
-def evalIfExpression(ie: ast.IfExpression, env: environment.Environment) -> tsobject.Object:
+def evalIdentifier(node: ast.Identifier, env: environment.Environment) -> tsobject.Object:
 	"""
-	Evaluates conditionals, e.g. "if (x) {y()} else {z = z + 1;}"
+	Evaluates an identifier, from its function's local slots if it was resolved to one, and
+	otherwise by looking its name up through the environment and then the builtins. A local
+	that hasn't been bound yet refers to whatever the name means in the enclosing scopes.
 
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (true) {10}")).ParseProgram(), environment.Environment()).Value
-	10
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (false) {10}")).ParseProgram(), environment.Environment())
-	null
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (1) {10}")).ParseProgram(), environment.Environment()).Value
-	10
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (1<2) {10};")).ParseProgram(), environment.Environment()).Value
-	10
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (1>2) {10};")).ParseProgram(), environment.Environment())
-	null
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (1>2) {10} else {20}")).ParseProgram(), environment.Environment()).Value
-	20
-	>>> evalProgram(parser.Parser(lexer.Lexer("if (1<2) {10} else {20};")).ParseProgram(), environment.Environment()).Value
-	10
+	>>> evalProgram(parser.Parser(lexer.Lexer("let x = 1; let f = function() {let y = x; let x = 2; [x, y]}; f();")).ParseProgram(), environment.Environment())
+	[2, 1]
+	>>> evalProgram(parser.Parser(lexer.Lexer("let f = function(x) {function() {x}}; f(3)();")).ParseProgram(), environment.Environment())
+	3
+	>>> evalProgram(parser.Parser(lexer.Lexer("function(x, x) {x}(1, 2);")).ParseProgram(), environment.Environment())
+	2
 	"""
-	condition = Eval(ie.Condition, env)
-	if isError(condition):
-		return condition
-
-	if isTruthy(condition):
-		return Eval(ie.Consequence, env)
-	if ie.Alternative is not None:
-		return Eval(ie.Alternative, env)
-	return NULL
+	slot = node.Slot
+	if slot >= 0:
+		if node.Depth:
+			val = env.GetAt(node.Depth, slot)
+		else:
+			slots = env.slots
+			val = environment.UNSET if slots is None else slots[slot]
+		if val is not environment.UNSET:
+			if not isinstance(val, tsobject.Object):
+				raise TypeError("ayy, what?")
+			return val
 
-def evalIdentifier(node: ast.Identifier, env: environment.Environment) -> tsobject.Object:
 	val, ok = env.Get(node.Value)
 	if ok:
 		if not isinstance(val, tsobject.Object):
 			raise TypeError("ayy, what?")
 		return val
 
-	return builtins.builtins.get(node.Value, newError(f"identifier not found: {node.Value}"))
-
-def isTruthy(o: tsobject.Object) -> bool:
-	if o is NULL or o is FALSE or o is UNDEFINED:
-		return False
-	return True
+	builtin = builtins.builtins.get(node.Value)
+	if builtin is None:
+		return newError(f"identifier not found: {node.Value}")
+	return builtin
 
 def newError(msg: str) -> tsobject.Error:
 	"""
@@ -411,23 +917,32 @@ def newError(msg: str) -> tsobject.Error:
 	return tsobject.Error(Message=msg)
 
 def isError(o: tsobject.Object) -> bool:
-	if o is not None:
-		return o.Type == tsobject.ObjectType.ERROR_OBJ
-	return False
+	return o.__class__ is _ErrCls
+
+def evalExpressions(exps: typing.List[ast.Expression], env: environment.Environment) -> typing.Tuple[typing.List[tsobject.Object], typing.Optional[tsobject.Error]]:
+	"""
+	Evaluates a list of expressions in order, stopping at the first error. Returns the list of
+	results and None, or an empty list and the error.
 
-def evalExpressions(exps: typing.List[ast.Expression], env: environment.Environment) -> tsobject.Object:
+	>>> evalExpressions(parser.Parser(lexer.Lexer("[1, 1+1]")).ParseProgram().Statements[0].Expression.Elements, environment.Environment())
+	([1, 2], None)
+	>>> evalExpressions(parser.Parser(lexer.Lexer("[1, -true, 3]")).ParseProgram().Statements[0].Expression.Elements, environment.Environment())
+	([], ERROR: unknown operator: -BOOLEAN)
+	"""
 	result = []
+	append = result.append
 	for e in exps:
 		evaluated = Eval(e, env)
-		if isError(evaluated):
-			return [evaluated]
-		result.append(evaluated)
+		if evaluated.__class__ is _ErrCls:
+			return [], evaluated
+		append(evaluated)
 
-	return result
+	return result, None
 
-def applyFunction(fn: tsobject.Object, *args: typing.Tuple[tsobject.Object]) -> tsobject.Object:
+def applyFunction(fn: tsobject.Object, args: typing.List[tsobject.Object]) -> tsobject.Object:
 	"""
-	Applies a function to its arguments.
+	Applies a function to its arguments. The function takes ownership of the argument list,
+	which must not be used again by the caller.
 
 	>>> evalProgram(parser.Parser(lexer.Lexer("let identity = function(x){x;}; identity(5);")).ParseProgram(), environment.Environment()).Value
 	5
@@ -513,21 +1028,128 @@ def applyFunction(fn: tsobject.Object, *args: typing.Tuple[tsobject.Object]) ->
 	ERROR: wrong number of arguments. got=1, want=2
 	>>> evalProgram(parser.Parser(lexer.Lexer('push("foo", 1)')).ParseProgram(), environment.Environment())
 	ERROR: first argument to `push` must be ARRAY, got STRING
+	>>> evalProgram(parser.Parser(lexer.Lexer('let a = [1]; let b = push(a, 2); [a, b]')).ParseProgram(), environment.Environment())
+	[[1, 2], [1, 2]]
+	>>> evalProgram(parser.Parser(lexer.Lexer('let a = [1]; let h = {"a": a}; puts(a); puts(h); push(a, 2); puts(a); puts(h);')).ParseProgram(), environment.Environment())
+	[1]
+	{a: [1]}
+	[1, 2]
+	{a: [1, 2]}
+	undefined
+	>>> evalProgram(parser.Parser(lexer.Lexer("let count = function(n, acc) {if (n == 0) {return acc;} return count(n - 1, acc + 1);}; count(5000, 0);")).ParseProgram(), environment.Environment())
+	5000
+	>>> evalProgram(parser.Parser(lexer.Lexer("let f = function() {return len(5);}; f();")).ParseProgram(), environment.Environment())
+	ERROR: argument to `len` not supported, got INTEGER
+	>>> evalProgram(parser.Parser(lexer.Lexer("let f = function() {return 5(1);}; f();")).ParseProgram(), environment.Environment())
+	ERROR: not a function: INTEGER
+	"""
+	# Tail calls come back from the function body as _TailCall objects, and are made by
+	# looping here instead of recursing.
+	while True:
+		fnType = fn.Type
+		if fnType is _FUNCTION_OBJ:
+			literal = fn.Literal
+			if literal is not None:
+				kernel = literal.Kernel
+				if kernel is None:
+					literal.Calls += 1
+					if literal.Calls >= _HOT_CALLS:
+						kernel = literal.Kernel = compileKernel(literal)
+				if kernel and len(args) == len(fn.Parameters) and all(arg.__class__ is _IntCls for arg in args):
+					result = kernel(*[arg.Value for arg in args])
+					if result is True or result is False:
+						return TRUE if result else FALSE
+					return _mkint(result)
+
+			try:
+				extendedEnv = extendFunctionEnv(fn, args)
+				result = Eval(fn.Body, extendedEnv)
+			except ValueError as e:
+				return newError(str(e))
+
+			if result.__class__ is _TailCall:
+				fn, args = result.Fn, result.Args
+				continue
+			return unwrapReturnValue(result)
+
+		if fnType is _BUILTIN_OBJ:
+			return fn.Fn(*args)
+
+		return newError(f"not a function: {fn.Type}")
+
+# The number of calls after which a function literal's body is considered for compilation.
+_HOT_CALLS = 50
+
+_ARITHMETIC = frozenset(("+", "-", "*", "/"))
+_COMPARISONS = frozenset(("<", ">", "==", "!="))
+
+def _arithmeticSource(node: ast.Expression) -> typing.Optional[str]:
+	"""
+	Returns Python source code computing the given expression from its function's arguments,
+	or None if it isn't made purely of integer arithmetic on literals and the function's own
+	parameters.
+	"""
+	nodeType = type(node)
+	if nodeType is ast.IntegerLiteral:
+		return repr(node.Value)
+	if nodeType is ast.Identifier:
+		return f"a{node.Slot}" if node.Slot >= 0 and not node.Depth else None
+	if nodeType is ast.PrefixExpression and node.Operator == "-":
+		right = _arithmeticSource(node.Right)
+		return None if right is None else f"(-{right})"
+	if nodeType is ast.InfixExpression and node.Operator in _ARITHMETIC:
+		left, right = _arithmeticSource(node.Left), _arithmeticSource(node.Right)
+		if left is None or right is None:
+			return None
+		return f"({left} {node.Operator} {right})"
+	return None
 
+def compileKernel(literal: ast.FunctionLiteral) -> typing.Union[bool, typing.Callable[..., typing.Any]]:
 	"""
-	if isinstance(fn, tsobject.Function):
-		try:
-			extendedEnv = extendFunctionEnv(fn, *args)
-			return unwrapReturnValue(Eval(fn.Body, extendedEnv))
-		except ValueError as e:
-			return newError(str(e))
+	Compiles the body of a resolved function literal into a Python function that takes and
+	returns plain numbers, if the body is a single expression (or return) of integer
+	arithmetic on the parameters, optionally topped by one comparison. Returns False for any
+	other body.
+
+	Operands are only ever numbers, and booleans only appear as the result, so these bodies
+	can't produce errors and Python's operators give exactly the results the evaluator would.
+	(Division by zero raises either way.)
+
+	>>> p = parser.Parser(lexer.Lexer("function(x, y) {return x * x - y / 2;}; function(x) {-x < 3}; function(x) {x + f(x)};")).ParseProgram()
+	>>> resolve(p)
+	>>> square = compileKernel(p.Statements[0].Expression)
+	>>> square(3, 4)
+	7.0
+	>>> compileKernel(p.Statements[1].Expression)(-4)
+	False
+	>>> compileKernel(p.Statements[2].Expression)
+	False
+	>>> evalProgram(parser.Parser(lexer.Lexer("let f = function(x) {x*x}; let g = function(n, acc) {if (n < 1) {acc} else {g(n-1, acc + f(n))}}; g(100, 0);")).ParseProgram(), environment.Environment())
+	338350
+	"""
+	if literal.Locals is None or len(literal.Body.Statements) != 1:
+		return False
 
-	if isinstance(fn, tsobject.Builtin):
-		return fn.Fn(*args)
+	stmt = literal.Body.Statements[0]
+	if type(stmt) is ast.ExpressionStatement:
+		expr = stmt.Expression
+	elif type(stmt) is ast.ReturnStatement:
+		expr = stmt.ReturnValue
+	else:
+		return False
 
-	return newError(f"not a function: {fn.Type}")
+	if type(expr) is ast.InfixExpression and expr.Operator in _COMPARISONS:
+		left, right = _arithmeticSource(expr.Left), _arithmeticSource(expr.Right)
+		source = None if left is None or right is None else f"{left} {expr.Operator} {right}"
+	else:
+		source = _arithmeticSource(expr)
+	if source is None:
+		return False
 
-def extendFunctionEnv(fn: tsobject.Function, *args: typing.Tuple[tsobject.Object]) -> environment.Environment:
+	params = ", ".join(f"a{i}" for i in range(len(literal.Parameters)))
+	return eval(compile(f"lambda {params}: {source}", "<ptsc kernel>", "eval"), {})
+
+def extendFunctionEnv(fn: tsobject.Function, args: typing.List[tsobject.Object]) -> environment.Environment:
 	"""
 	Extends the execution environment of a function by adding its defined arguments to their
 	specified parameter labels.
@@ -539,19 +1161,28 @@ def extendFunctionEnv(fn: tsobject.Function, *args: typing.Tuple[tsobject.Object
 	if len(args) != len(fn.Parameters):
 		raise ValueError(f"Incorrect number of arguments, expected {len(fn.Parameters)}, got {len(args)}")
 	env = environment.Environment(outer=fn.Env)
+	if fn.Locals is not None:
+		# The argument list is always freshly built for the call, so it can become the slot
+		# list itself rather than being copied.
+		env.names = fn.Locals
+		unbound = fn.NumLocals - len(args)
+		env.slots = args + [environment.UNSET] * unbound if unbound else args
+		return env
+
 	for i, p in enumerate(fn.Parameters):
 		env.Set(p.Value, args[i])
 	return env
 
 def unwrapReturnValue(o: tsobject.Object) -> tsobject.Object:
-	if isinstance(o, tsobject.ReturnValue):
+	if o.__class__ is _RetCls:
 		return o.Value
 	return o
 
 def evalIndexExpression(left: tsobject.Object, index: tsobject.Object) -> tsobject.Object:
-	if left.Type == tsobject.ObjectType.ARRAY_OBJ and index.Type == tsobject.ObjectType.INTEGER_OBJ:
+	leftCls = left.__class__
+	if leftCls is _ArrCls and index.__class__ is _IntCls:
 		return evalArrayIndexExpression(left, index)
-	if left.Type == tsobject.ObjectType.HASH_OBJ:
+	if leftCls is _HashCls:
 		return evalHashIndexExpression(left, index)
 	return newError(f"index operator not supported: {left.Type}")
 
@@ -580,9 +1211,11 @@ def evalArrayIndexExpression(arr: tsobject.Array, index: tsobject.Integer) -> ts
 	>>> evalProgram(parser.Parser(lexer.Lexer('[1,2,3][-1]')).ParseProgram(), environment.Environment())
 	undefined
 	"""
-	if index.Value < 0 or index.Value > len(arr.Elements) - 1:
-		return UNDEFINED
-	return arr.Elements[index.Value]
+	i = index.Value
+	elems = arr.Elements
+	if 0 <= i < len(elems):
+		return elems[i]
+	return UNDEFINED
 
 def evalHashLiteral(node: ast.HashLiteral, env: environment.Environment) -> tsobject.Object:
 	"""
@@ -590,24 +1223,56 @@ def evalHashLiteral(node: ast.HashLiteral, env: environment.Environment) -> tsob
 
 	>>> evalProgram(parser.Parser(lexer.Lexer('let two = "two"; {"one": 10-9, two: 1+1, "thr"+"ee": 6/2, 4:4, true: 5, false: 6}')).ParseProgram(), environment.Environment())
 	{one: 1, two: 2, three: 3.0, 4: 4, true: 5, false: 6}
+	>>> evalProgram(parser.Parser(lexer.Lexer('{1: "one", true: "yes", 0: "zero", false: "no"}')).ParseProgram(), environment.Environment())
+	{1: one, true: yes, 0: zero, false: no}
 	"""
+	prepared = node.Prepared
+	if prepared is None:
+		prepared = node.Prepared = _prepareHashLiteral(node)
+
 	pairs = {}
-	for k, v in node.Pairs.items():
-		key = Eval(k, env)
-		if isError(key):
-			return key
+	for hashed, key, v in prepared:
+		if hashed is None:
+			key = Eval(key, env)
+			if key.__class__ is _ErrCls:
+				return key
 
-		if not hasattr(key, "HashKey"):
-			return newError(f"unusable as hash key: {key.Type}")
+			if not hasattr(key, "HashKey"):
+				return newError(f"unusable as hash key: {key.Type}")
+			hashed = key.HashKey()
 
 		value = Eval(v, env)
-		if isError(value):
+		if value.__class__ is _ErrCls:
 			return value
 
-		hashed = key.HashKey()
 		pairs[hashed] = tsobject.HashPair(Key=key, Value=value)
 	return tsobject.Hash(Pairs=pairs)
 
+def _prepareHashLiteral(node: ast.HashLiteral) -> typing.List[typing.Tuple[typing.Any, typing.Any, ast.Expression]]:
+	"""
+	Builds a list of a hash literal's pairs, in order, as (hashed key, key, value node)
+	tuples. Literal keys are evaluated and hashed once, here; for any other key the hashed key
+	is None and the key is its node, to be evaluated each time.
+
+	>>> p = parser.Parser(lexer.Lexer('{"a": 1, b: 2, 3: 3, true: 4}')).ParseProgram()
+	>>> [(h is not None, str(k)) for h, k, _ in _prepareHashLiteral(p.Statements[0].Expression)]
+	[(True, 'a'), (False, 'b'), (True, '3'), (True, 'true')]
+	"""
+	prepared = []
+	for k, v in zip(node.Keys, node.Values):
+		kType = type(k)
+		if kType is ast.StringLiteral:
+			key = tsobject.String(Value=k.Value)
+		elif kType is ast.IntegerLiteral:
+			key = _mkint(k.Value)
+		elif kType is ast.Boolean:
+			key = TRUE if k.Value else FALSE
+		else:
+			prepared.append((None, k, v))
+			continue
+		prepared.append((key.HashKey(), key, v))
+	return prepared
+
 def evalHashIndexExpression(hash: tsobject.Hash, index: tsobject.Object) -> tsobject.Object:
 	"""
 	Evaluates an object index expression.
@@ -632,3 +1297,27 @@ def evalHashIndexExpression(hash: tsobject.Hash, index: tsobject.Object) -> tsob
 
 	key = index.HashKey()
 	return hash.Pairs[key].Value if key in hash.Pairs else UNDEFINED
+
+# Maps each concrete node class to the function that evaluates it; see Eval. The classes that
+# Eval evaluates inline map to Eval itself, for callers that look a handler up directly.
+_DISPATCH: typing.Dict[type, typing.Callable[[ast.Node, environment.Environment], typing.Optional[tsobject.Object]]] = {
+	ast.Program: evalProgram,
+	ast.BlockStatement: Eval,
+	ast.ExpressionStatement: _evalExpressionStatement,
+	ast.ReturnStatement: Eval,
+	ast.LetStatement: _evalLetStatement,
+	ast.IntegerLiteral: _evalInteger,
+	ast.StringLiteral: _evalString,
+	ast.Boolean: _evalBoolean,
+	ast.PrefixExpression: _evalPrefix,
+	ast.InfixExpression: Eval,
+	ast.IfExpression: Eval,
+	ast.Identifier: Eval,
+	ast.FunctionLiteral: _evalFunction,
+	ast.CallExpression: Eval,
+	ast.ArrayLiteral: _evalArray,
+	ast.IndexExpression: _evalIndex,
+	ast.HashLiteral: evalHashLiteral,
+}
+# Bound once, so that Eval's lookup is a single global load and call.
+_handlerFor = _DISPATCH.get
@@ -1,58 +1,50 @@
-from . import tstoken
+import re
+import sys
+import typing
 
-class Lexer():
-	def __init__(self, input: str):
-		self.input = input
-		self.position = 0
-		self.readPosition = 0
-		self.ch = ''
-		self.readChar()
+from . import tstoken
 
-	def readChar(self):
-		if self.readPosition >= len(self.input):
-			self.ch = str(b'\x00')
-		else:
-			self.ch = self.input[self.readPosition]
-		self.position = self.readPosition
-		self.readPosition += 1
+# Matches a single token, along with any whitespace before it. Exactly one group matches:
+# an identifier or keyword, an integer, a string (whose closing quote may be missing at the
+# end of the input), an operator or punctuation mark, any other (illegal) character, or -
+# when nothing does - the end of the input.
+_TOKEN = re.compile(r'[ \t\n\r]*(?:([A-Za-z_]+)|([0-9]+)|"([^"]*)"?|(==|!=|[-=+!/*<>;:,{}()\[\]])|(.))?', re.S)
 
-	def skipWhitespace(self):
-		while self.ch in ' \t\n\r':
-			self.readChar()
+# The characters that may make up identifiers and integers, respectively; these agree with
+# the character classes in _TOKEN.
+_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+_DIGITS = frozenset("0123456789")
 
-	def peekChar(self) -> str:
-		if self.readPosition >= len(self.input):
-			return str(b'\x00')
-		return self.input[self.readPosition]
+# Tokens are never modified once they're made, so every token whose literal is fixed - the
+# operators and punctuation, keywords, and EOF - is made only once, here.
+_PUNCTUATION = {lit: tstoken.Token(Type=t, Literal=lit) for lit, t in tstoken.punctuation.items()}
+_KEYWORDS = {lit: tstoken.Token(Type=t, Literal=lit) for lit, t in tstoken.keywords.items()}
+_EOF = tstoken.Token(Type=tstoken.TokenType.EOF, Literal="")
 
-	def readIdentifier(self) -> str:
-		pos = self.position
-		while self.isLetter(self.ch):
-			self.readChar()
-		return self.input[pos:self.position]
+_IDENT = tstoken.TokenType.IDENT
+_INT = tstoken.TokenType.INT
+_STRING = tstoken.TokenType.STRING
+_ILLEGAL = tstoken.TokenType.ILLEGAL
 
-	def readNumber(self) -> str:
-		pos = self.position
-		while self.isDigit(self.ch):
-			self.readChar()
-		return self.input[pos:self.position]
+class Lexer():
+	__slots__ = ("input", "position")
 
-	def readString(self) -> str:
-		pos = self.position + 1
-		while True:
-			self.readChar()
-			if self.ch == '"' or self.ch == str(b'\x00'):
-				break
-		return self.input[pos:self.position]
+	def __init__(self, input: str):
+		self.input = input
+		# The offset of the first character that hasn't been read yet.
+		self.position = 0
 
 	@staticmethod
 	def isLetter(ch: str) -> bool:
-		char = ord(ch)
-		return ord('a') <= char and char <= ord('z') or ord('A') <= char and char <= ord('Z') or ch == '_'
+		"""
+		>>> Lexer.isLetter("_"), Lexer.isLetter("Z"), Lexer.isLetter("1"), Lexer.isLetter("é")
+		(True, True, False, False)
+		"""
+		return ch in _LETTERS
 
 	@staticmethod
 	def isDigit(ch: str) -> bool:
-		return ord('0') <= ord(ch) and ord(ch) <= ord('9')
+		return ch in _DIGITS
 
 	def NextToken(self) -> tstoken.Token:
 		"""
@@ -252,72 +244,55 @@ class Lexer():
 		Token(Type='TokenType.RBRACE', Literal='}')
 		>>> l.NextToken()
 		Token(Type='TokenType.EOF', Literal='')
+		>>> Lexer("+").NextToken() is Lexer("+").NextToken()
+		True
+		>>> l = Lexer('x"y')
+		>>> l.NextToken(), l.NextToken(), l.NextToken()
+		(Token(Type='TokenType.IDENT', Literal='x'), Token(Type='TokenType.STRING', Literal='y'), Token(Type='TokenType.EOF', Literal=''))
 		"""
-		self.skipWhitespace()
+		m = _TOKEN.match(self.input, self.position)
+		self.position = m.end()
+		return _tokenFor(m)
 
-		tok = tstoken.Token()
-		if self.ch == '=':
-			if self.peekChar() == '=':
-				ch = self.ch
-				self.readChar()
-				literal = ch + self.ch
-				tok = tstoken.Token(Type=tstoken.TokenType.EQ, Literal=literal)
-			else:
-				tok = newToken(tstoken.TokenType.ASSIGN, self.ch)
-		elif self.ch == '+':
-			tok = newToken(tstoken.TokenType.PLUS, self.ch)
-		elif self.ch == '-':
-			tok = newToken(tstoken.TokenType.MINUS, self.ch)
-		elif self.ch == '!':
-			if self.peekChar() == '=':
-				ch = self.ch
-				self.readChar()
-				literal = ch + self.ch
-				tok = tstoken.Token(Type=tstoken.TokenType.NOT_EQ, Literal=literal)
-			else:
-				tok = newToken(tstoken.TokenType.BANG, self.ch)
-		elif self.ch == '/':
-			tok = newToken(tstoken.TokenType.SLASH, self.ch)
-		elif self.ch == '*':
-			tok = newToken(tstoken.TokenType.ASTERISK, self.ch)
-		elif self.ch == '<':
-			tok = newToken(tstoken.TokenType.LT, self.ch)
-		elif self.ch == '>':
-			tok = newToken(tstoken.TokenType.GT, self.ch)
-		elif self.ch == ';':
-			tok = newToken(tstoken.TokenType.SEMICOLON, self.ch)
-		elif self.ch == ':':
-			tok = newToken(tstoken.TokenType.COLON, self.ch)
-		elif self.ch == ',':
-			tok = newToken(tstoken.TokenType.COMMA, self.ch)
-		elif self.ch == '{':
-			tok = newToken(tstoken.TokenType.LBRACE, self.ch)
-		elif self.ch == '}':
-			tok = newToken(tstoken.TokenType.RBRACE, self.ch)
-		elif self.ch == '(':
-			tok = newToken(tstoken.TokenType.LPAREN, self.ch)
-		elif self.ch == ')':
-			tok = newToken(tstoken.TokenType.RPAREN, self.ch)
-		elif self.ch == '"':
-			tok = tstoken.Token(Type=tstoken.TokenType.STRING, Literal=self.readString())
-		elif self.ch == '[':
-			tok = newToken(tstoken.TokenType.LBRACKET, self.ch)
-		elif self.ch == ']':
-			tok = newToken(tstoken.TokenType.RBRACKET, self.ch)
-		elif self.ch == str(b'\x00'):
-			tok = tstoken.Token(Type=tstoken.TokenType.EOF, Literal="")
-		else:
-			if self.isLetter(self.ch):
-				lit = self.readIdentifier()
-				return tstoken.Token(Type=tstoken.lookupIdent(lit), Literal=lit)
-			elif self.isDigit(self.ch):
-				lit = self.readNumber()
-				return tstoken.Token(Type=tstoken.TokenType.INT, Literal=lit)
-			else:
-				tok = newToken(tstoken.TokenType.ILLEGAL, self.ch)
+	def Tokens(self) -> typing.List[tstoken.Token]:
+		"""
+		Reads all of the remaining tokens in the input, up to and including EOF.
+
+		>>> Lexer("let x = 5; ").Tokens()
+		[Token(Type='TokenType.LET', Literal='let'), Token(Type='TokenType.IDENT', Literal='x'), Token(Type='TokenType.ASSIGN', Literal='='), Token(Type='TokenType.INT', Literal='5'), Token(Type='TokenType.SEMICOLON', Literal=';'), Token(Type='TokenType.EOF', Literal='')]
+		>>> Lexer("").Tokens()
+		[Token(Type='TokenType.EOF', Literal='')]
+		"""
+		tokens = []
+		append = tokens.append
+		for m in _TOKEN.finditer(self.input, self.position):
+			tok = _tokenFor(m)
+			append(tok)
+			if tok is _EOF:
+				break
+		self.position = len(self.input)
+		return tokens
 
-		self.readChar()
-		return tok
+def _tokenFor(m: typing.Match[str]) -> tstoken.Token:
+	"""
+	Returns the token for a match of _TOKEN.
+	"""
+	group = m.lastindex
+	if group is None:
+		return _EOF
+	lit = m.group(group)
+	if group == 4:
+		return _PUNCTUATION[lit]
+	if group == 1:
+		keyword = _KEYWORDS.get(lit)
+		if keyword is not None:
+			return keyword
+		return tstoken.Token(Type=_IDENT, Literal=sys.intern(lit))
+	if group == 2:
+		return tstoken.Token(Type=_INT, Literal=lit, IntValue=int(lit))
+	if group == 3:
+		return tstoken.Token(Type=_STRING, Literal=lit)
+	return tstoken.Token(Type=_ILLEGAL, Literal=lit)
 
 def newToken(tstokenType: tstoken.TokenType, ch: str) -> tstoken.Token:
 	return tstoken.Token(Type=tstokenType, Literal=ch)
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import enum
 import typing
 
@@ -28,6 +30,51 @@ precedences: typing.Dict[tstoken.TokenType, Precedence] = {
 	tstoken.TokenType.LBRACKET: Precedence.INDEX
 }
 
+# The precedence of every token type, indexed by type. These, and the precedences passed
+# around while parsing, are plain ints rather than Precedence members. A semicolon is given
+# a precedence below LOWEST, so that it ends an expression without a separate check.
+_PRECEDENCES: typing.Tuple[int, ...] = tuple(
+	-1 if t is tstoken.TokenType.SEMICOLON else int(precedences.get(t, Precedence.LOWEST))
+	for t in tstoken.TokenType
+)
+_LOWEST = int(Precedence.LOWEST)
+_PREFIX = int(Precedence.PREFIX)
+
+# The token types the parser checks for, bound to module globals so that each check is a
+# single lookup.
+_ASSIGN = tstoken.TokenType.ASSIGN
+_BANG = tstoken.TokenType.BANG
+_COLON = tstoken.TokenType.COLON
+_COMMA = tstoken.TokenType.COMMA
+_ELSE = tstoken.TokenType.ELSE
+_EOF = tstoken.TokenType.EOF
+_IDENT = tstoken.TokenType.IDENT
+_LBRACE = tstoken.TokenType.LBRACE
+_LET = tstoken.TokenType.LET
+_LPAREN = tstoken.TokenType.LPAREN
+_MINUS = tstoken.TokenType.MINUS
+_RBRACE = tstoken.TokenType.RBRACE
+_RBRACKET = tstoken.TokenType.RBRACKET
+_RETURN = tstoken.TokenType.RETURN
+_RPAREN = tstoken.TokenType.RPAREN
+_SEMICOLON = tstoken.TokenType.SEMICOLON
+_TRUE = tstoken.TokenType.TRUE
+
+# Boolean literals carry nothing but their value, so every one of them is parsed into one of
+# these two shared nodes.
+_TRUE_LITERAL = ast.Boolean(Value=True, Token=tstoken.Token(Type=tstoken.TokenType.TRUE, Literal="true"))
+_FALSE_LITERAL = ast.Boolean(Value=False, Token=tstoken.Token(Type=tstoken.TokenType.FALSE, Literal="false"))
+
+def _table(fns: typing.Dict[tstoken.TokenType, typing.Callable[..., typing.Any]]) -> typing.List[typing.Optional[typing.Callable[..., typing.Any]]]:
+	"""
+	Turns a mapping of token types to parsing functions into a list indexed by token type,
+	holding None for types with no function.
+	"""
+	table: typing.List[typing.Optional[typing.Callable[..., typing.Any]]] = [None] * len(tstoken.TokenType)
+	for t, fn in fns.items():
+		table[t] = fn
+	return table
+
 class Parser():
 	"""
 	Parser is the class responsible for parsing every part of a program. Pass it input through a
@@ -86,6 +133,8 @@ class Parser():
 	>>> Parser(lexer.Lexer("add(a * b[2], b[1], 2 * [1, 2][1]);")).ParseProgram()
 	add((a * (b[2])), (b[1]), (2 * ([1, 2][1])))
 	"""
+	__slots__ = ("l", "errors", "curToken", "peekToken", "prefixParseFns", "infixParseFns", "eof", "tokens", "intLiterals", "stringLiterals")
+
 	def __init__(self, l: lexer.Lexer):
 		self.l = l
 		self.errors: typing.List[str] = []
@@ -93,49 +142,38 @@ class Parser():
 		self.curToken: tstoken.Token = None
 		self.peekToken: tstoken.Token = None
 
-		self.prefixParseFns = {
-			tstoken.TokenType.IDENT: self.parseIdentifier,
-			tstoken.TokenType.INT: self.parseIntegerLiteral,
-			tstoken.TokenType.STRING: self.parseStringLiteral,
-			tstoken.TokenType.BANG: self.parsePrefixExpression,
-			tstoken.TokenType.MINUS: self.parsePrefixExpression,
-			tstoken.TokenType.TRUE: self.parseBoolean,
-			tstoken.TokenType.FALSE: self.parseBoolean,
-			tstoken.TokenType.LPAREN: self.parseGroupedExpression,
-			tstoken.TokenType.IF: self.parseIfExpression,
-			tstoken.TokenType.FUNCTION: self.parseFunctionLiteral,
-			tstoken.TokenType.LBRACKET: self.parseArrayLiteral,
-			tstoken.TokenType.LBRACE: self.parseHashLiteral
-		}
-
-		self.infixParseFns = {
-			tstoken.TokenType.PLUS: self.parseInfixExpression,
-			tstoken.TokenType.MINUS: self.parseInfixExpression,
-			tstoken.TokenType.SLASH: self.parseInfixExpression,
-			tstoken.TokenType.ASTERISK: self.parseInfixExpression,
-			tstoken.TokenType.EQ: self.parseInfixExpression,
-			tstoken.TokenType.NOT_EQ: self.parseInfixExpression,
-			tstoken.TokenType.LT: self.parseInfixExpression,
-			tstoken.TokenType.GT: self.parseInfixExpression,
-			tstoken.TokenType.LPAREN: self.parseCallExpression,
-			tstoken.TokenType.LBRACKET: self.parseIndexExpression
-		}
+		# These are shared, module-level tables of plain functions, which take the parser as
+		# their first argument.
+		self.prefixParseFns = _PREFIX_PARSE_FNS
+		self.infixParseFns = _INFIX_PARSE_FNS
+
+		# Integer and string literal nodes, by literal. Nothing changes a literal node after
+		# it's been parsed (the evaluator only caches its object on it), so each distinct
+		# literal in the input is parsed into a single node, shared by all its occurrences.
+		self.intLiterals: typing.Dict[str, ast.IntegerLiteral] = {}
+		self.stringLiterals: typing.Dict[str, ast.StringLiteral] = {}
+
+		# The whole input is tokenized up front; once it's used up, every following token is
+		# the lexer's final EOF token.
+		tokens = l.Tokens()
+		self.eof = tokens[-1]
+		self.tokens = iter(tokens)
 
 		self.nextToken()
 		self.nextToken()
 
 	def nextToken(self):
 		self.curToken = self.peekToken
-		self.peekToken = self.l.NextToken()
+		self.peekToken = next(self.tokens, self.eof)
 
 	def curTokenIs(self, t: tstoken.TokenType) -> bool:
-		return self.curToken.Type == t
+		return self.curToken.Type is t
 
 	def peekTokenIs(self, t: tstoken.TokenType) -> bool:
-		return self.peekToken.Type == t
+		return self.peekToken.Type is t
 
 	def expectPeek(self, t: tstoken.TokenType) -> bool:
-		if self.peekTokenIs(t):
+		if self.peekToken.Type is t:
 			self.nextToken()
 			return True
 		self.peekError(t)
@@ -151,20 +189,23 @@ class Parser():
 		self.errors.append(f"no prefix parse function for {t} found")
 
 	def ParseProgram(self) -> ast.Program:
-		p = ast.Program()
+		statements: typing.List[ast.Statement] = []
+		append = statements.append
 
-		while not self.curTokenIs(tstoken.TokenType.EOF):
+		eof = _EOF
+		while self.curToken.Type is not eof:
 			stmt = self.parseStatement()
 			if stmt is not None:
-				p.Statements.append(stmt)
+				append(stmt)
 			self.nextToken()
 
-		return p
+		return ast.Program(Statements=statements)
 
 	def parseStatement(self) -> ast.Statement:
-		if self.curToken.Type == tstoken.TokenType.LET:
+		curType = self.curToken.Type
+		if curType is _LET:
 			return self.parseLetStatement()
-		if self.curToken.Type == tstoken.TokenType.RETURN:
+		if curType is _RETURN:
 			return self.parseReturnStatement()
 		return self.parseExpressionStatement()
 
@@ -202,18 +243,18 @@ class Parser():
 		"""
 		stmt = ast.LetStatement(Token=self.curToken)
 
-		if not self.expectPeek(tstoken.TokenType.IDENT):
+		if not self.expectPeek(_IDENT):
 			return None
 
 		stmt.Name = ast.Identifier(Value=self.curToken.Literal, Token=self.curToken)
 
-		if not self.expectPeek(tstoken.TokenType.ASSIGN):
+		if not self.expectPeek(_ASSIGN):
 			return None
 
 		self.nextToken()
-		stmt.Value = self.parseExpression(Precedence.LOWEST)
+		stmt.Value = self.parseExpression(_LOWEST)
 
-		if self.peekTokenIs(tstoken.TokenType.SEMICOLON):
+		if self.peekToken.Type is _SEMICOLON:
 			self.nextToken()
 
 		return stmt
@@ -236,44 +277,49 @@ class Parser():
 
 		self.nextToken()
 
-		stmt.ReturnValue = self.parseExpression(Precedence.LOWEST)
+		stmt.ReturnValue = self.parseExpression(_LOWEST)
 
-		if self.peekTokenIs(tstoken.TokenType.SEMICOLON):
+		if self.peekToken.Type is _SEMICOLON:
 			self.nextToken()
 
 		return stmt
 
 	def parseExpressionStatement(self) -> ast.ExpressionStatement:
 		stmt = ast.ExpressionStatement(Token=self.curToken)
-		stmt.Expression = self.parseExpression(Precedence.LOWEST)
+		stmt.Expression = self.parseExpression(_LOWEST)
 
-		if self.peekTokenIs(tstoken.TokenType.SEMICOLON):
+		if self.peekToken.Type is _SEMICOLON:
 			self.nextToken()
 
 		return stmt
 
-	def parseExpression(self, prec: Precedence) -> typing.Optional[ast.Expression]:
-		prefix = self.prefixParseFns.get(self.curToken.Type, None)
+	def parseExpression(self, prec: int) -> typing.Optional[ast.Expression]:
+		prefix = self.prefixParseFns[self.curToken.Type]
 		if prefix is None:
 			self.noPrefixParseFnError(self.curToken.Type)
 			return None
-		leftExp = prefix()
-
-		while not self.peekTokenIs(tstoken.TokenType.SEMICOLON) and prec < self.peekPrecedence():
-			infix = self.infixParseFns.get(self.peekToken.Type, None)
+		leftExp = prefix(self)
+
+		# The peekPrecedence check is inlined here, since this loop runs once per
+		# operator in the input.
+		infixParseFns = self.infixParseFns
+		peekType = self.peekToken.Type
+		while prec < _PRECEDENCES[peekType]:
+			infix = infixParseFns[peekType]
 			if infix is None:
 				return leftExp
 
 			self.nextToken()
-			leftExp = infix(leftExp)
+			leftExp = infix(self, leftExp)
+			peekType = self.peekToken.Type
 
 		return leftExp
 
-	def peekPrecedence(self) -> Precedence:
-		return precedences.get(self.peekToken.Type, Precedence.LOWEST)
+	def peekPrecedence(self) -> int:
+		return _PRECEDENCES[self.peekToken.Type]
 
-	def curPrecedence(self) -> Precedence:
-		return precedences.get(self.curToken.Type, Precedence.LOWEST)
+	def curPrecedence(self) -> int:
+		return _PRECEDENCES[self.curToken.Type]
 
 	def parseIdentifier(self) -> ast.Expression:
 		"""
@@ -300,16 +346,27 @@ class Parser():
 		5
 		>>> p.Statements[0].Expression.TokenLiteral()
 		'5'
+		>>> p = Parser(lexer.Lexer("5 + 5;")).ParseProgram()
+		>>> p.Statements[0].Expression.Left is p.Statements[0].Expression.Right
+		True
 		"""
-		lit = ast.IntegerLiteral(Token=self.curToken)
-
-		try:
-			value = int(self.curToken.Literal)
-		except (ValueError, TypeError):
-			self.errors.append(f"could not parse {self.curToken} as integer")
-			return None
+		tok = self.curToken
+		lit = self.intLiterals.get(tok.Literal)
+		if lit is not None:
+			return lit
+		lit = ast.IntegerLiteral(Token=tok)
+
+		# The lexer converts the literal already; only hand-built tokens need parsing here.
+		value = tok.IntValue
+		if value is None:
+			try:
+				value = int(tok.Literal)
+			except (ValueError, TypeError):
+				self.errors.append(f"could not parse {tok} as integer")
+				return None
 
 		lit.Value = value
+		self.intLiterals[tok.Literal] = lit
 		return lit
 
 	def parseStringLiteral(self) -> ast.Expression:
@@ -322,7 +379,11 @@ class Parser():
 		>>> p.Statements[0].Expression.Value
 		'hello world'
 		"""
-		return ast.StringLiteral(Value=self.curToken.Literal, Token=self.curToken)
+		tok = self.curToken
+		lit = self.stringLiterals.get(tok.Literal)
+		if lit is None:
+			lit = self.stringLiterals[tok.Literal] = ast.StringLiteral(Value=tok.Literal, Token=tok)
+		return lit
 
 	def parsePrefixExpression(self) -> ast.Expression:
 		"""
@@ -356,14 +417,28 @@ class Parser():
 		'!'
 		>>> p.Statements[0].Expression.Right.Value
 		False
+		>>> Parser(lexer.Lexer("!-!a[0];")).ParseProgram()
+		(!(-(!(a[0]))))
 		"""
-		expr = ast.PrefixExpression(Operator=self.curToken.Literal, Token=self.curToken)
-
+		# A run of prefix operators is collected in one loop, rather than recursing through
+		# parseExpression once per operator, and then linked up around their operand.
+		tok = self.curToken
+		chain = [ast.PrefixExpression(Operator=tok.Literal, Token=tok)]
 		self.nextToken()
 
-		expr.Right = self.parseExpression(Precedence.PREFIX)
+		curType = self.curToken.Type
+		while curType is _BANG or curType is _MINUS:
+			tok = self.curToken
+			chain.append(ast.PrefixExpression(Operator=tok.Literal, Token=tok))
+			self.nextToken()
+			curType = self.curToken.Type
 
-		return expr
+		right = self.parseExpression(_PREFIX)
+		for expr in reversed(chain):
+			expr.Right = right
+			right = expr
+
+		return right
 
 	def parseInfixExpression(self, left: ast.Expression) -> ast.Expression:
 		"""
@@ -489,13 +564,13 @@ class Parser():
 		>>> p.Statements[0].Expression.TokenLiteral()
 		'true'
 		"""
-		return ast.Boolean(Value=self.curTokenIs(tstoken.TokenType.TRUE), Token=self.curToken)
+		return _TRUE_LITERAL if self.curToken.Type is _TRUE else _FALSE_LITERAL
 
 	def parseGroupedExpression(self) -> typing.Optional[ast.Expression]:
 		self.nextToken()
-		exp = self.parseExpression(Precedence.LOWEST)
+		exp = self.parseExpression(_LOWEST)
 
-		return exp if self.expectPeek(tstoken.TokenType.RPAREN) else None
+		return exp if self.expectPeek(_RPAREN) else None
 
 	def parseIfExpression(self) -> typing.Optional[ast.Expression]:
 		"""
@@ -540,22 +615,22 @@ class Parser():
 		"""
 		expr = ast.IfExpression(Token=self.curToken)
 
-		if not self.expectPeek(tstoken.TokenType.LPAREN):
+		if not self.expectPeek(_LPAREN):
 			return None
 
 		self.nextToken()
-		expr.Condition = self.parseExpression(Precedence.LOWEST)
+		expr.Condition = self.parseExpression(_LOWEST)
 
-		if not self.expectPeek(tstoken.TokenType.RPAREN):
+		if not self.expectPeek(_RPAREN):
 			return None
-		if not self.expectPeek(tstoken.TokenType.LBRACE):
+		if not self.expectPeek(_LBRACE):
 			return None
 
 		expr.Consequence = self.parseBlockStatement()
-		if self.peekTokenIs(tstoken.TokenType.ELSE):
+		if self.peekToken.Type is _ELSE:
 			self.nextToken()
 
-			if not self.expectPeek(tstoken.TokenType.LBRACE):
+			if not self.expectPeek(_LBRACE):
 				return None
 
 			expr.Alternative = self.parseBlockStatement()
@@ -563,17 +638,22 @@ class Parser():
 		return expr
 
 	def parseBlockStatement(self) -> ast.BlockStatement:
-		block = ast.BlockStatement(Token=self.curToken)
+		tok = self.curToken
+		statements: typing.List[ast.Statement] = []
+		append = statements.append
 
 		self.nextToken()
 
-		while not self.curTokenIs(tstoken.TokenType.RBRACE) and not self.curTokenIs(tstoken.TokenType.EOF):
+		rbrace, eof = _RBRACE, _EOF
+		curType = self.curToken.Type
+		while curType is not rbrace and curType is not eof:
 			stmt = self.parseStatement()
 			if stmt is not None:
-				block.Statements.append(stmt)
+				append(stmt)
 			self.nextToken()
+			curType = self.curToken.Type
 
-		return block
+		return ast.BlockStatement(Token=tok, Statements=statements)
 
 	def parseFunctionLiteral(self) -> typing.Optional[ast.Expression]:
 		"""
@@ -599,12 +679,12 @@ class Parser():
 		"""
 		lit = ast.FunctionLiteral(Token=self.curToken)
 
-		if not self.expectPeek(tstoken.TokenType.LPAREN):
+		if not self.expectPeek(_LPAREN):
 			return None
 
 		lit.Parameters = self.parseFunctionParameters()
 
-		if not self.expectPeek(tstoken.TokenType.LBRACE):
+		if not self.expectPeek(_LBRACE):
 			return None
 
 		lit.Body = self.parseBlockStatement()
@@ -646,19 +726,23 @@ class Parser():
 		>>> params[2].Value
 		'z'
 		"""
-		if self.peekTokenIs(tstoken.TokenType.RPAREN):
+		if self.peekToken.Type is _RPAREN:
 			self.nextToken()
 			return []
 
-		self.nextToken()
+		nextToken = self.nextToken
+		nextToken()
 
 		idents = [ast.Identifier(Value=self.curToken.Literal, Token=self.curToken)]
-		while self.peekTokenIs(tstoken.TokenType.COMMA):
-			self.nextToken()
-			self.nextToken()
-			idents.append(ast.Identifier(Value=self.curToken.Literal, Token=self.curToken))
-
-		if not self.expectPeek(tstoken.TokenType.RPAREN):
+		append = idents.append
+		comma = _COMMA
+		while self.peekToken.Type is comma:
+			nextToken()
+			nextToken()
+			tok = self.curToken
+			append(ast.Identifier(Value=tok.Literal, Token=tok))
+
+		if not self.expectPeek(_RPAREN):
 			return None
 
 		return idents
@@ -691,21 +775,24 @@ class Parser():
 		5
 		"""
 		exp = ast.CallExpression(Function=func, Token=self.curToken)
-		exp.Arguments = self.parseExpressionList(tstoken.TokenType.RPAREN)
+		exp.Arguments = self.parseExpressionList(_RPAREN)
 		return exp
 
 	def parseExpressionList(self, end: tstoken.TokenType) -> typing.Optional[typing.List[ast.Expression]]:
-		if self.peekTokenIs(end):
+		if self.peekToken.Type is end:
 			self.nextToken()
 			return []
 
-		self.nextToken()
-		l = [self.parseExpression(Precedence.LOWEST)]
+		nextToken, parseExpression = self.nextToken, self.parseExpression
+		nextToken()
+		l = [parseExpression(_LOWEST)]
+		append = l.append
 
-		while self.peekTokenIs(tstoken.TokenType.COMMA):
-			self.nextToken()
-			self.nextToken()
-			l.append(self.parseExpression(Precedence.LOWEST))
+		comma = _COMMA
+		while self.peekToken.Type is comma:
+			nextToken()
+			nextToken()
+			append(parseExpression(_LOWEST))
 
 		return l if self.expectPeek(end) else None
 
@@ -735,7 +822,7 @@ class Parser():
 		3
 		"""
 		arr = ast.ArrayLiteral(Token=self.curToken)
-		arr.Elements = self.parseExpressionList(tstoken.TokenType.RBRACKET)
+		arr.Elements = self.parseExpressionList(_RBRACKET)
 		return arr
 
 	def parseIndexExpression(self, left: ast.Expression) -> typing.Optional[ast.Expression]:
@@ -764,9 +851,9 @@ class Parser():
 		exp = ast.IndexExpression(Left=left, Token=self.curToken)
 
 		self.nextToken()
-		exp.Index = self.parseExpression(Precedence.LOWEST)
+		exp.Index = self.parseExpression(_LOWEST)
 
-		return exp if self.expectPeek(tstoken.TokenType.RBRACKET) else None
+		return exp if self.expectPeek(_RBRACKET) else None
 
 	def parseHashLiteral(self) -> typing.Optional[ast.Expression]:
 		"""
@@ -775,10 +862,10 @@ class Parser():
 		>>> p = Parser(lexer.Lexer('{"one": 1, "two": 2, "three": 3};')).ParseProgram()
 		>>> len(p.Statements)
 		1
-		>>> pairs = p.Statements[0].Expression.Pairs
-		>>> len(pairs)
-		3
-		>>> for k, v in pairs.items():
+		>>> h = p.Statements[0].Expression
+		>>> len(h.Keys), len(h.Values)
+		(3, 3)
+		>>> for k, v in zip(h.Keys, h.Values):
 		... 	print(k.Value,v.Value)
 		...
 		one 1
@@ -787,15 +874,15 @@ class Parser():
 		>>> p = Parser(lexer.Lexer("{}")).ParseProgram()
 		>>> len(p.Statements)
 		1
-		>>> len(p.Statements[0].Expression.Pairs)
+		>>> len(p.Statements[0].Expression.Keys)
 		0
 		>>> p = Parser(lexer.Lexer('{"one": 0+1, "two": 10-8, "three": 15/5}')).ParseProgram()
 		>>> len(p.Statements)
 		1
-		>>> pairs = p.Statements[0].Expression.Pairs
-		>>> len(pairs)
-		3
-		>>> for k, v in pairs.items():
+		>>> h = p.Statements[0].Expression
+		>>> len(h.Keys), len(h.Values)
+		(3, 3)
+		>>> for k, v in zip(h.Keys, h.Values):
 		... 	print(k.Value, v.Left.Value, v.Operator, v.Right.Value)
 		...
 		one 0 + 1
@@ -803,38 +890,52 @@ class Parser():
 		three 15 / 5
 		"""
 		h = ast.HashLiteral(Token=self.curToken)
+		keys, values = h.Keys, h.Values
 
-		while not self.peekTokenIs(tstoken.TokenType.RBRACE):
+		rbrace = _RBRACE
+		while self.peekToken.Type is not rbrace:
 			self.nextToken()
-			key = self.parseExpression(Precedence.LOWEST)
+			key = self.parseExpression(_LOWEST)
 
-			if not self.expectPeek(tstoken.TokenType.COLON):
+			if not self.expectPeek(_COLON):
 				return None
 
 			self.nextToken()
-			v = self.parseExpression(Precedence.LOWEST)
+			v = self.parseExpression(_LOWEST)
 
-			h.Pairs[key] = v
+			keys.append(key)
+			values.append(v)
 
-			if not self.peekTokenIs(tstoken.TokenType.RBRACE) and not self.expectPeek(tstoken.TokenType.COMMA):
+			if self.peekToken.Type is not rbrace and not self.expectPeek(_COMMA):
 				return None
 
-		return h if self.expectPeek(tstoken.TokenType.RBRACE) else None
-
-traceLevel = 0
-traceIdentPlaceholder = '\t'
-
-def identLevel() -> str:
-	return "".join([traceIdentPlaceholder]*traceLevel)
-
-def tracePrint(fs: str):
-	print(identLevel, fs, sep="")
-
-def trace(msg: str) -> str:
-	traceLevel += 1
-	tracePrint(f"BEGIN {msg}")
-	return msg
-
-def untrace(msg: str):
-	tracePrint(f"END {msg}")
-	traceLevel -= 1
+		return h if self.expectPeek(_RBRACE) else None
+
+# The prefix and infix parsing functions of every token type, indexed by type.
+_PREFIX_PARSE_FNS = _table({
+	tstoken.TokenType.IDENT: Parser.parseIdentifier,
+	tstoken.TokenType.INT: Parser.parseIntegerLiteral,
+	tstoken.TokenType.STRING: Parser.parseStringLiteral,
+	tstoken.TokenType.BANG: Parser.parsePrefixExpression,
+	tstoken.TokenType.MINUS: Parser.parsePrefixExpression,
+	tstoken.TokenType.TRUE: Parser.parseBoolean,
+	tstoken.TokenType.FALSE: Parser.parseBoolean,
+	tstoken.TokenType.LPAREN: Parser.parseGroupedExpression,
+	tstoken.TokenType.IF: Parser.parseIfExpression,
+	tstoken.TokenType.FUNCTION: Parser.parseFunctionLiteral,
+	tstoken.TokenType.LBRACKET: Parser.parseArrayLiteral,
+	tstoken.TokenType.LBRACE: Parser.parseHashLiteral
+})
+
+_INFIX_PARSE_FNS = _table({
+	tstoken.TokenType.PLUS: Parser.parseInfixExpression,
+	tstoken.TokenType.MINUS: Parser.parseInfixExpression,
+	tstoken.TokenType.SLASH: Parser.parseInfixExpression,
+	tstoken.TokenType.ASTERISK: Parser.parseInfixExpression,
+	tstoken.TokenType.EQ: Parser.parseInfixExpression,
+	tstoken.TokenType.NOT_EQ: Parser.parseInfixExpression,
+	tstoken.TokenType.LT: Parser.parseInfixExpression,
+	tstoken.TokenType.GT: Parser.parseInfixExpression,
+	tstoken.TokenType.LPAREN: Parser.parseCallExpression,
+	tstoken.TokenType.LBRACKET: Parser.parseIndexExpression
+})
@@ -4,9 +4,7 @@ import typing
 
 from . import environment
 from . import evaluator
-from . import lexer
 from . import tsobject
-from . import parser
 
 PROMPT = os.environ.get("PS2", ">> ")
 
@@ -19,13 +17,12 @@ def Start(In: io.TextIOWrapper, Out: io.TextIOWrapper):
 		if not l:
 			return
 
-		p = parser.Parser(lexer.Lexer(l))
-		program = p.ParseProgram()
-		if p.Errors():
-			printParserErrors(Out, p.Errors())
+		program, errors = evaluator.Parse(l)
+		if errors:
+			printParserErrors(Out, errors)
 			continue
 
-		evaluated = evaluator.Eval(program, env)
+		evaluated = evaluator.runProgram(program, env)
 		if evaluated is not None:
 			Out.write(evaluated.Inspect())
 			Out.write('\n')
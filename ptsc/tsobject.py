@@ -7,25 +7,69 @@ from . import environment
 class BuiltinFunction():
 	pass
 
-class ObjectType(enum.Enum):
-	NULL_OBJ = "NULL"
-	UNDEFINED_OBJ = "UNDEFINED"
-	ERROR_OBJ = "ERROR"
-	INTEGER_OBJ = "INTEGER"
-	BOOLEAN_OBJ = "BOOLEAN"
-	STRING_OBJ = "STRING"
-	RETURN_VALUE_OBJ = "RETURN_VALUE"
-	FUNCTION_OBJ = "FUNCTION"
-	BUILTIN_OBJ = "BUILTIN"
-	ARRAY_OBJ = "ARRAY"
-	HASH_OBJ = "HASH"
+# The printed name of each ObjectType, indexed by type.
+_OBJECT_TYPE_NAMES = (
+	"NULL",
+	"UNDEFINED",
+	"ERROR",
+	"INTEGER",
+	"BOOLEAN",
+	"STRING",
+	"RETURN_VALUE",
+	"FUNCTION",
+	"BUILTIN",
+	"ARRAY",
+	"HASH",
+	"TAIL_CALL"
+)
+
+class ObjectType(enum.IntEnum):
+	"""
+	The types of objects. Like tstoken.TokenType these are small ints, so comparing and hashing
+	them is cheap, but they print as the names used in error messages.
+
+	>>> str(ObjectType.INTEGER_OBJ)
+	'INTEGER'
+	>>> f"unknown operator: {ObjectType.STRING_OBJ} - {ObjectType.STRING_OBJ}"
+	'unknown operator: STRING - STRING'
+	"""
+	NULL_OBJ = 0
+	UNDEFINED_OBJ = 1
+	ERROR_OBJ = 2
+	INTEGER_OBJ = 3
+	BOOLEAN_OBJ = 4
+	STRING_OBJ = 5
+	RETURN_VALUE_OBJ = 6
+	FUNCTION_OBJ = 7
+	BUILTIN_OBJ = 8
+	ARRAY_OBJ = 9
+	HASH_OBJ = 10
+	# The evaluator's pending tail calls, which never escape the function call making them.
+	TAIL_CALL_OBJ = 11
 
 	def __str__(self) -> str:
-		return self.value
+		return _OBJECT_TYPE_NAMES[self]
+
+	def __format__(self, spec: str) -> str:
+		return format(str(self), spec)
+
+# Looking up an enum member goes through the enum's metaclass every time, which is a large
+# part of the cost of constructing an object, so the ones used below are bound to plain names.
+_NULL_OBJ = ObjectType.NULL_OBJ
+_ERROR_OBJ = ObjectType.ERROR_OBJ
+_INTEGER_OBJ = ObjectType.INTEGER_OBJ
+_BOOLEAN_OBJ = ObjectType.BOOLEAN_OBJ
+_STRING_OBJ = ObjectType.STRING_OBJ
+_RETURN_VALUE_OBJ = ObjectType.RETURN_VALUE_OBJ
+_FUNCTION_OBJ = ObjectType.FUNCTION_OBJ
+_BUILTIN_OBJ = ObjectType.BUILTIN_OBJ
+_ARRAY_OBJ = ObjectType.ARRAY_OBJ
+_HASH_OBJ = ObjectType.HASH_OBJ
 
 class Object():
-	def __init__(self, *args, Type: ObjectType = ObjectType.UNDEFINED_OBJ, **kwargs):
-		super().__init__(*args, **kwargs)
+	__slots__ = ("Type",)
+
+	def __init__(self, Type: ObjectType = ObjectType.UNDEFINED_OBJ):
 		self.Type = Type
 
 	def Inspect(self) -> str:
@@ -34,9 +78,11 @@ class Object():
 	def __repr__(self) -> str:
 		return self.Inspect()
 
-class HashKey():
+class HashKey(typing.NamedTuple):
 	"""
-	Represents the hashed value of any hashable object.
+	Represents the hashed value of any hashable object: its type, along with its underlying
+	Python value. Two objects are the same key only if both match, so that e.g. 1 and true
+	are different keys.
 
 	>>> String(Value="Hello World").HashKey() == String(Value="Hello World").HashKey()
 	True
@@ -44,37 +90,43 @@ class HashKey():
 	True
 	>>> String(Value="Hello World").HashKey() == String(Value="My name is johnny").HashKey()
 	False
+	>>> Integer(Value=1).HashKey() == Boolean(Value=True).HashKey()
+	False
 	"""
-	def __init__(self, *args, Type: ObjectType = ObjectType.UNDEFINED_OBJ, Value: int = 0, **kwargs):
-		super().__init__(*args, **kwargs)
-		self.Type = Type
-		self.Value = Value
+	Type: ObjectType
+	Value: typing.Hashable
 
 class Integer(Object):
-	def __init__(self, *args, Value: int = 0, **kwargs):
-		super().__init__(*args, Type=ObjectType.INTEGER_OBJ, **kwargs)
+	__slots__ = ("Value",)
+
+	def __init__(self, Value: int = 0):
+		self.Type = _INTEGER_OBJ
 		self.Value = Value
 
 	def Inspect(self) -> str:
 		return str(self.Value)
 
 	def HashKey(self) -> HashKey:
-		return self.Value
+		return HashKey(_INTEGER_OBJ, self.Value)
 
 class Boolean(Object):
-	def __init__(self, *args, Value: bool = False, **kwargs):
-		super().__init__(*args, Type=ObjectType.BOOLEAN_OBJ, **kwargs)
+	__slots__ = ("Value",)
+
+	def __init__(self, Value: bool = False):
+		self.Type = _BOOLEAN_OBJ
 		self.Value = Value
 
 	def Inspect(self) -> str:
 		return str(self.Value).lower()
 
 	def HashKey(self) -> HashKey:
-		return hash(self.Value)
+		return HashKey(_BOOLEAN_OBJ, self.Value)
 
 class Null(Object):
-	def __init__(self, *args, **kwargs):
-		super().__init__(*args, Type=ObjectType.NULL_OBJ, **kwargs)
+	__slots__ = ()
+
+	def __init__(self):
+		self.Type = _NULL_OBJ
 
 	def Inspect(self) -> str:
 		return "null"
@@ -83,65 +135,153 @@ class Null(Object):
 		return "null"
 
 class ReturnValue(Object):
-	def __init__(self, *args, Value: Object = None, **kwargs):
-		super().__init__(*args, Type=ObjectType.RETURN_VALUE_OBJ, **kwargs)
+	__slots__ = ("Value",)
+
+	def __init__(self, Value: Object = None):
+		self.Type = _RETURN_VALUE_OBJ
 		self.Value = Value if Value else Object()
 
 	def Inspect(self) -> str:
 		return self.Value.Inspect()
 
 class Error(Object):
-	def __init__(self, *args, Message: str = "", **kwargs):
-		super().__init__(*args, Type=ObjectType.ERROR_OBJ, **kwargs)
+	__slots__ = ("Message",)
+
+	def __init__(self, Message: str = ""):
+		self.Type = _ERROR_OBJ
 		self.Message = Message
 
 	def Inspect(self) -> str:
 		return f"ERROR: {self.Message}"
 
 class Function(Object):
-	def __init__(self, *args, Parameters: typing.List[ast.Identifier] = None, Body: ast.BlockStatement = None, Env = None, **kwargs):
-		super().__init__(*args, Type=ObjectType.FUNCTION_OBJ, **kwargs)
+	__slots__ = ("Parameters", "Body", "Env", "Locals", "NumLocals", "Literal", "Inspected")
+
+	def __init__(self, Parameters: typing.List[ast.Identifier] = None, Body: ast.BlockStatement = None, Env = None, Locals: typing.Dict[str, int] = None, NumLocals: int = 0, Literal: ast.FunctionLiteral = None):
+		self.Type = _FUNCTION_OBJ
 		self.Parameters = Parameters if Parameters else []
 		self.Body = Body if Body else ast.BlockStatement()
 		self.Env = Env if Env else environment.Environment()
+		self.Locals = Locals
+		self.NumLocals = NumLocals
+		self.Literal = Literal
+		# Inspect's result, built on first use; functions never change once created.
+		self.Inspected: typing.Optional[str] = None
 
 	def Inspect(self) -> str:
-		return f"function({', '.join(str(p) for p in self.Parameters)}) {{\n{self.Body}\n}}"
+		inspected = self.Inspected
+		if inspected is None:
+			inspected = self.Inspected = f"function({', '.join(str(p) for p in self.Parameters)}) {{\n{self.Body}\n}}"
+		return inspected
 
 class String(Object):
-	def __init__(self, *args, Value: str = "", **kwargs):
-		super().__init__(*args, Type=ObjectType.STRING_OBJ, **kwargs)
+	__slots__ = ("Value",)
+
+	def __init__(self, Value: str = ""):
+		self.Type = _STRING_OBJ
 		self.Value = Value
 
 	def Inspect(self) -> str:
 		return self.Value
 
 	def HashKey(self) -> HashKey:
-		return hash(self.Value)
+		return HashKey(_STRING_OBJ, self.Value)
 
 class Builtin(Object):
-	def __init__(self, *args, Fn: BuiltinFunction = None, **kwargs):
-		super().__init__(*args, Type=ObjectType.BUILTIN_OBJ, **kwargs)
+	__slots__ = ("Fn",)
+
+	def __init__(self, Fn: BuiltinFunction = None):
+		self.Type = _BUILTIN_OBJ
 		self.Fn = Fn if Fn else BuiltinFunction()
 
 	def Inspect(self) -> str:
 		return "builtin function"
 
 class Array(Object):
-	def __init__(self, *args, Elements: typing.List[Object] = None, **kwargs):
-		super().__init__(*args, Type=ObjectType.ARRAY_OBJ, **kwargs)
+	"""
+	An array. Its Inspect string is cached, but the push builtin appends to Elements in place,
+	and the array it returns shares the same list, so a cached string is only used while the
+	list still has the length it was built for. Arrays that hold arrays or hashes, whose
+	contents can change underneath them, aren't cached at all.
+
+	>>> a = Array(Elements=[Integer(Value=1)])
+	>>> b = Array(Elements=a.Elements)
+	>>> c = Array(Elements=[a])
+	>>> a.Inspect(), b.Inspect(), c.Inspect()
+	('[1]', '[1]', '[[1]]')
+	>>> a.Elements.append(Integer(Value=2))
+	>>> a.Inspect(), b.Inspect(), c.Inspect()
+	('[1, 2]', '[1, 2]', '[[1, 2]]')
+	"""
+	__slots__ = ("Elements", "Inspected", "InspectedLength")
+
+	def __init__(self, Elements: typing.List[Object] = None):
+		self.Type = _ARRAY_OBJ
 		self.Elements = Elements if Elements else []
+		self.Inspected: typing.Optional[str] = None
+		self.InspectedLength = 0
 
 	def Inspect(self) -> str:
-		return f"[{', '.join(str(e) for e in self.Elements)}]"
+		elements = self.Elements
+		inspected = self.Inspected
+		if inspected is None or self.InspectedLength != len(elements):
+			inspected = f"[{', '.join(str(e) for e in elements)}]"
+			if not any(e.__class__ is Array or e.__class__ is Hash for e in elements):
+				self.Inspected = inspected
+				self.InspectedLength = len(elements)
+		return inspected
+
+class HashPair():
+	"""
+	A key-value pair of a Hash, stored under the key's HashKey.
+	"""
+	__slots__ = ("Key", "Value")
 
-HashPair = typing.NamedTuple('HashPair', [('Key', Object), ('Value', Object)])
+	def __init__(self, Key: Object, Value: Object):
+		self.Key = Key
+		self.Value = Value
 
 class Hash(Object):
-	def __init__(self, *args, Pairs: typing.Dict[HashKey, HashPair] = None, **kwargs):
-		super().__init__(*args, Type=ObjectType.HASH_OBJ, **kwargs)
+	__slots__ = ("Pairs", "Inspected")
+
+	def __init__(self, Pairs: typing.Dict[HashKey, HashPair] = None):
+		self.Type = _HASH_OBJ
 		self.Pairs = Pairs if Pairs else {}
+		# Inspect's result, built on first use. Hashes are never modified once created, but
+		# arrays in them can be, so hashes holding arrays or hashes aren't cached.
+		self.Inspected: typing.Optional[str] = None
 
 	def Inspect(self) -> str:
-		pairs = ', '.join(': '.join((k.Inspect(),v.Inspect())) for k, v in self.Pairs.values())
-		return f"{{{pairs}}}"
+		inspected = self.Inspected
+		if inspected is None:
+			pairs = self.Pairs.values()
+			inspected = f"{{{', '.join([f'{p.Key.Inspect()}: {p.Value.Inspect()}' for p in pairs])}}}"
+			if not any(p.Value.__class__ is Array or p.Value.__class__ is Hash for p in pairs):
+				self.Inspected = inspected
+		return inspected
+
+NULL = Null()
+UNDEFINED = Object()
+TRUE = Boolean(Value=True)
+FALSE = Boolean(Value=False)
+
+# Preallocated Integer objects for small values, which are by far the most common results of
+# arithmetic. Integer objects are never mutated, so sharing them is safe.
+_INT_CACHE_MIN = -128
+_INT_CACHE_MAX = 256
+_INT_CACHE = [Integer(Value=i) for i in range(_INT_CACHE_MIN, _INT_CACHE_MAX+1)]
+
+def newInteger(value: int) -> Integer:
+	"""
+	Returns an Integer object for the given value, reusing a cached one where possible.
+
+	>>> newInteger(5) is newInteger(5)
+	True
+	>>> newInteger(1000) is newInteger(1000)
+	False
+	>>> newInteger(2.0)
+	2.0
+	"""
+	if _INT_CACHE_MIN <= value <= _INT_CACHE_MAX and value.__class__ is int:
+		return _INT_CACHE[value - _INT_CACHE_MIN]
+	return Integer(Value=value)
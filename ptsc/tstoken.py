@@ -1,53 +1,95 @@
 import enum
+import typing
 
-class TokenType(enum.Enum):
-	ILLEGAL = "ILLEGAL"
-	EOF = "EOF"
-
-	IDENT = "IDENT"
-	INT = "INT"
-	STRING = "STRING"
-
-	ASSIGN = "="
-	PLUS = "+"
-	MINUS = "-"
-	BANG = "!"
-	ASTERISK = "*"
-	SLASH = "/"
-
-	LT = "<"
-	GT = ">"
-
-	EQ = "=="
-	NOT_EQ = "!="
-
-	COMMA = ","
-	SEMICOLON = ";"
-	COLON = ":"
-
-	LPAREN = "("
-	RPAREN = ")"
-	LBRACE = "{"
-	RBRACE = "}"
-	LBRACKET = "["
-	RBRACKET = "]"
-
-	FUNCTION = "FUNCTION"
-	LET = "LET"
-	TRUE = "TRUE"
-	FALSE = "FALSE"
-	IF = "IF"
-	ELSE = "ELSE"
-	RETURN = "RETURN"
+class TokenType(enum.IntEnum):
+	"""
+	The types of tokens. These are small, dense integers, so that tables of things about each
+	token type can be lists indexed by type.
+
+	>>> str(TokenType.IDENT)
+	'TokenType.IDENT'
+	>>> f"{TokenType.IDENT}"
+	'TokenType.IDENT'
+	"""
+	ILLEGAL = 0
+	EOF = 1
+
+	IDENT = 2
+	INT = 3
+	STRING = 4
+
+	ASSIGN = 5
+	PLUS = 6
+	MINUS = 7
+	BANG = 8
+	ASTERISK = 9
+	SLASH = 10
+
+	LT = 11
+	GT = 12
+
+	EQ = 13
+	NOT_EQ = 14
+
+	COMMA = 15
+	SEMICOLON = 16
+	COLON = 17
+
+	LPAREN = 18
+	RPAREN = 19
+	LBRACE = 20
+	RBRACE = 21
+	LBRACKET = 22
+	RBRACKET = 23
+
+	FUNCTION = 24
+	LET = 25
+	TRUE = 26
+	FALSE = 27
+	IF = 28
+	ELSE = 29
+	RETURN = 30
+
+	def __str__(self) -> str:
+		return f"TokenType.{self.name}"
+
+	def __format__(self, spec: str) -> str:
+		return format(str(self), spec)
 
 class Token:
-	def __init__(self, Type: TokenType = TokenType.ILLEGAL, Literal: str = ""):
+	__slots__ = ("Type", "Literal", "IntValue")
+
+	def __init__(self, Type: TokenType = TokenType.ILLEGAL, Literal: str = "", IntValue: typing.Optional[int] = None):
 		self.Type = Type
 		self.Literal = Literal
+		# The value of an INT token, as converted by the lexer; None for any other token.
+		self.IntValue = IntValue
 
 	def __repr__(self) -> str:
 		return f"Token(Type='{self.Type}', Literal='{self.Literal}')"
 
+punctuation = {
+	"=": TokenType.ASSIGN,
+	"+": TokenType.PLUS,
+	"-": TokenType.MINUS,
+	"!": TokenType.BANG,
+	"*": TokenType.ASTERISK,
+	"/": TokenType.SLASH,
+	"<": TokenType.LT,
+	">": TokenType.GT,
+	"==": TokenType.EQ,
+	"!=": TokenType.NOT_EQ,
+	",": TokenType.COMMA,
+	";": TokenType.SEMICOLON,
+	":": TokenType.COLON,
+	"(": TokenType.LPAREN,
+	")": TokenType.RPAREN,
+	"{": TokenType.LBRACE,
+	"}": TokenType.RBRACE,
+	"[": TokenType.LBRACKET,
+	"]": TokenType.RBRACKET
+}
+
 keywords = {
 	"function": TokenType.FUNCTION,
 	"let": TokenType.LET,
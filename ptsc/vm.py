@@ -0,0 +1,246 @@
+"""
+This module contains a stack-based virtual machine, which executes the bytecode produced by
+the compiler module. It works on the same objects as the tree-walking evaluator, and shares
+its environments and builtins, so a program can be run by either one. They differ in one case:
+a return statement always returns from the enclosing function here, while the evaluator
+treats a return inside an if expression that is used as a value, as in "let x = if (c)
+{return 3;}; 4", as producing that value instead. Calls in tail position - directly followed
+by the function's return - reuse the caller's frame, like the evaluator's tail calls, so deep
+tail recursion works in both.
+
+>>> Run(parser.Parser(lexer.Lexer("let a = 5; a * 2;")).ParseProgram(), environment.Environment())
+10
+>>> Run(parser.Parser(lexer.Lexer("let fib = function(n) {if (n < 2) {return n;} fib(n-1) + fib(n-2);}; fib(15);")).ParseProgram(), environment.Environment())
+610
+>>> Run(parser.Parser(lexer.Lexer("let newAdder = function(x){return function(y){return x+y;};}; let addTwo=newAdder(2); addTwo(2);")).ParseProgram(), environment.Environment())
+4
+>>> Run(parser.Parser(lexer.Lexer("if (10>1) {if (10>1) {return 10;}; return 1;}")).ParseProgram(), environment.Environment())
+10
+>>> Run(parser.Parser(lexer.Lexer("50/2*2+10;")).ParseProgram(), environment.Environment())
+60.0
+>>> Run(parser.Parser(lexer.Lexer('"Hello" + " " + "World!"')).ParseProgram(), environment.Environment())
+Hello World!
+>>> Run(parser.Parser(lexer.Lexer("if (1>2) {10};")).ParseProgram(), environment.Environment())
+null
+>>> Run(parser.Parser(lexer.Lexer("[1, 2*2, 3+3][1]")).ParseProgram(), environment.Environment())
+4
+>>> Run(parser.Parser(lexer.Lexer('let two = "two"; {"one": 10-9, two: 1+1, "thr"+"ee": 6/2, 4:4, true: 5, false: 6}')).ParseProgram(), environment.Environment())
+{one: 1, two: 2, three: 3.0, 4: 4, true: 5, false: 6}
+>>> Run(parser.Parser(lexer.Lexer('{"foo":5}["foo"]')).ParseProgram(), environment.Environment())
+5
+>>> Run(parser.Parser(lexer.Lexer("len(rest(push([1, 2], 3)));")).ParseProgram(), environment.Environment())
+2
+>>> Run(parser.Parser(lexer.Lexer("!-5;")).ParseProgram(), environment.Environment())
+false
+>>> Run(parser.Parser(lexer.Lexer("5; true+false; 5;")).ParseProgram(), environment.Environment())
+ERROR: unknown operator: BOOLEAN + BOOLEAN
+>>> Run(parser.Parser(lexer.Lexer("foobar;")).ParseProgram(), environment.Environment())
+ERROR: identifier not found: foobar
+>>> Run(parser.Parser(lexer.Lexer("function(x){x;}(1, 2);")).ParseProgram(), environment.Environment())
+ERROR: Incorrect number of arguments, expected 1, got 2
+>>> Run(parser.Parser(lexer.Lexer('{"name": "Monkey"}[function(x){x}];')).ParseProgram(), environment.Environment())
+ERROR: unusable as hash key: FUNCTION
+>>> Run(parser.Parser(lexer.Lexer("")).ParseProgram(), environment.Environment())
+undefined
+>>> Run(parser.Parser(lexer.Lexer("let x = 1; let f = function() {let y = x; let x = 2; y + x;}; f();")).ParseProgram(), environment.Environment())
+3
+>>> Run(parser.Parser(lexer.Lexer("let f = function(a) {let b = a * 2; function() {a + b}}; f(3)();")).ParseProgram(), environment.Environment())
+9
+>>> Run(parser.Parser(lexer.Lexer("let count = function(n, acc) {if (n == 0) {return acc;} return count(n - 1, acc + 1);}; count(5000, 0);")).ParseProgram(), environment.Environment())
+5000
+>>> Run(parser.Parser(lexer.Lexer("let f = function(n) {if (n == 0) {return 0;} return f(n - 1) + 1;}; f(100);")).ParseProgram(), environment.Environment())
+100
+"""
+
+import typing
+
+from . import ast
+from . import builtins
+from . import compiler
+from . import environment
+from . import evaluator
+from . import tsobject
+from . import parser, lexer
+from .compiler import (
+	OP_CONST, OP_POP, OP_ADD, OP_NEQ, OP_NEG, OP_NOT, OP_GET, OP_SET, OP_JMP, OP_JMPF,
+	OP_CALL, OP_RET, OP_ARR, OP_IDX, OP_HASH, OP_CLOSURE, OP_HASHABLE, OP_GETL, OP_SETL
+)
+
+# The operator strings for OP_ADD through OP_NEQ, used when falling back on the evaluator.
+_OPERATORS = ("+", "-", "*", "/", "<", ">", "==", "!=")
+
+_Error = tsobject.Error
+
+class Closure(tsobject.Function):
+	"""
+	A function value created by the VM, which carries its compiled body along with the parsed
+	one, so that it can still be called by the evaluator.
+	"""
+	__slots__ = ("Code",)
+
+	def __init__(self, Code: compiler.Bytecode = None, **kwargs):
+		super().__init__(**kwargs)
+		self.Code = Code
+
+class _Abort(Exception):
+	"""
+	Raised to unwind the VM when an instruction produces an error object.
+	"""
+	def __init__(self, error: tsobject.Error):
+		super().__init__(error.Message)
+		self.Error = error
+
+def check(result: tsobject.Object) -> tsobject.Object:
+	if result.__class__ is _Error:
+		raise _Abort(result)
+	return result
+
+def Run(program: ast.Program, env: environment.Environment) -> tsobject.Object:
+	"""
+	Compiles and runs an entire program, with a given environment.
+	"""
+	try:
+		return execute(compiler.Compile(evaluator.prepare(program)), env)
+	except _Abort as e:
+		return e.Error
+
+def callEnv(fn: Closure, args: typing.List[tsobject.Object]) -> environment.Environment:
+	"""
+	Builds the environment that a call of a VM function runs in.
+	"""
+	params = fn.Parameters
+	if len(args) != len(params):
+		raise _Abort(evaluator.newError(f"Incorrect number of arguments, expected {len(params)}, got {len(args)}"))
+	env = environment.Environment(outer=fn.Env)
+	if fn.Locals is not None:
+		env.names = fn.Locals
+		env.slots = args + [environment.UNSET] * (fn.NumLocals - len(args))
+	else:
+		for p, arg in zip(params, args):
+			env.Set(p.Value, arg)
+	return env
+
+def callFunction(fn: tsobject.Object, args: typing.List[tsobject.Object]) -> tsobject.Object:
+	if fn.__class__ is Closure:
+		return execute(fn.Code, callEnv(fn, args))
+	return check(evaluator.applyFunction(fn, args))
+
+def execute(code: compiler.Bytecode, env: environment.Environment) -> tsobject.Object:
+	instructions = code.Instructions
+	constants = code.Constants
+	stack = []
+	push = stack.append
+	pop = stack.pop
+	Integer = tsobject.Integer
+	mkint = tsobject.newInteger
+	TRUE, FALSE, NULL, UNDEFINED = tsobject.TRUE, tsobject.FALSE, tsobject.NULL, tsobject.UNDEFINED
+	UNSET = environment.UNSET
+	slots = env.slots
+	pc = 0
+
+	while True:
+		op = instructions[pc]
+		arg = instructions[pc+1]
+		pc += 2
+
+		if op == OP_GETL:
+			val = slots[arg]
+			if val is UNSET:
+				# Not yet bound by its let statement, so it refers to an outer binding.
+				name = code.Names[arg]
+				val, ok = env.outer.Get(name) if env.outer is not None else (None, False)
+				if not ok:
+					val = builtins.builtins.get(name)
+					if val is None:
+						raise _Abort(evaluator.newError(f"identifier not found: {name}"))
+			push(val)
+		elif op == OP_CONST:
+			push(constants[arg])
+		elif op == OP_GET:
+			name = constants[arg]
+			val, ok = env.Get(name)
+			if not ok:
+				val = builtins.builtins.get(name)
+				if val is None:
+					raise _Abort(evaluator.newError(f"identifier not found: {name}"))
+			push(val)
+		elif OP_ADD <= op <= OP_NEQ:
+			right = pop()
+			left = stack[-1]
+			if left.__class__ is Integer and right.__class__ is Integer:
+				value = evaluator.intBinop(op - OP_ADD, left.Value, right.Value)
+				if value.__class__ is bool:
+					stack[-1] = TRUE if value else FALSE
+				else:
+					stack[-1] = mkint(value)
+			else:
+				stack[-1] = check(evaluator.evalInfixExpression(_OPERATORS[op - OP_ADD], left, right))
+		elif op == OP_CALL:
+			if arg:
+				args = stack[-arg:]
+				del stack[-arg:]
+			else:
+				args = []
+			fn = stack[-1]
+			if fn.__class__ is Closure and instructions[pc] == OP_RET:
+				# A call in tail position runs in this frame instead of recursing, so deep tail
+				# recursion doesn't exhaust the Python stack.
+				code = fn.Code
+				env = callEnv(fn, args)
+				instructions, constants, slots = code.Instructions, code.Constants, env.slots
+				del stack[:]
+				pc = 0
+				continue
+			stack[-1] = callFunction(fn, args)
+		elif op == OP_JMPF:
+			cond = pop()
+			if cond is NULL or cond is FALSE or cond is UNDEFINED:
+				pc = arg
+		elif op == OP_POP:
+			pop()
+		elif op == OP_RET:
+			return pop()
+		elif op == OP_JMP:
+			pc = arg
+		elif op == OP_SETL:
+			slots[arg] = stack[-1]
+			stack[-1] = None
+		elif op == OP_SET:
+			env.Set(constants[arg], stack[-1])
+			stack[-1] = None
+		elif op == OP_CLOSURE:
+			fn = constants[arg]
+			literal = fn.Literal
+			push(Closure(Parameters=literal.Parameters, Body=literal.Body, Env=env, Locals=literal.Locals, NumLocals=literal.NumLocals, Literal=literal, Code=fn.Code))
+		elif op == OP_NEG:
+			right = stack[-1]
+			if right.__class__ is Integer:
+				stack[-1] = mkint(-right.Value)
+			else:
+				stack[-1] = check(evaluator.evalMinusPrefixOperatorExpression(right))
+		elif op == OP_NOT:
+			stack[-1] = evaluator.evalBangOperatorExpression(stack[-1])
+		elif op == OP_IDX:
+			index = pop()
+			stack[-1] = check(evaluator.evalIndexExpression(stack[-1], index))
+		elif op == OP_ARR:
+			if arg:
+				elems = stack[-arg:]
+				del stack[-arg:]
+			else:
+				elems = []
+			push(tsobject.Array(Elements=elems))
+		elif op == OP_HASHABLE:
+			if not hasattr(stack[-1], "HashKey"):
+				raise _Abort(evaluator.newError(f"unusable as hash key: {stack[-1].Type}"))
+		elif op == OP_HASH:
+			pairs = {}
+			if arg:
+				items = stack[-2*arg:]
+				del stack[-2*arg:]
+				for i in range(0, 2*arg, 2):
+					key = items[i]
+					pairs[key.HashKey()] = tsobject.HashPair(Key=key, Value=items[i+1])
+			push(tsobject.Hash(Pairs=pairs))
+		else:
+			raise ValueError(f"unknown opcode: {op}")
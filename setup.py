@@ -28,8 +28,6 @@ setup(
 		'Programming Language :: Python :: Implementation :: CPython',
 		'Programming Language :: Python :: Implementation :: PyPy',
 		'Programming Language :: Python :: 3 :: Only',
-		'Programming Language :: Python :: 3.5',
-		'Programming Language :: Python :: 3.6',
 		'Programming Language :: Python :: 3.7'
 	],
 	keywords='Typescript compiler',
@@ -41,5 +39,5 @@ setup(
 			'ptsc=ptsc.__init__:main',
 		],
 	},
-	python_requires='~=3.5'
+	python_requires='~=3.7'
 )